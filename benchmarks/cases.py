@@ -0,0 +1,149 @@
+from src.backends import FakeBackend
+from src.events import NullSink
+from src.game.chess import ChessGame, ChessAIPlayer
+from src.game.chess.movegen import SQUARE_INDEX
+from src.game.chess.perft import POSITIONS, perft
+from src.game.connectfour import ConnectFourGame, BitboardConnectFourGame, ConnectFourAIPlayer
+from src.game.tictactoe import TicTacToeGame, TicTacToeAIPlayer
+
+QUIET = NullSink()
+
+OPENING = ["e2-e4", "e7-e5", "g1-f3", "b8-c6", "f1-c4", "g8-f6", "d2-d3", "f8-c5", "b1-c3", "d7-d6",
+           "c1-g5", "c8-g4", "h2-h3", "g4-h5", "g2-g4", "h5-g6", "d1-e2", "d8-e7", "a2-a3", "a7-a6"]
+
+# Curated chess positions, reached by playing these moves from the start
+CHESS_POSITIONS = {
+    "opening": OPENING,
+    "check": ["e2-e4", "f7-f6", "d1-h5"],  # black to move, in check, can block with g7-g6
+    "mate": ["f2-f3", "e7-e5", "g2-g4"],  # black to play d8-h4, fool's mate
+}
+
+CONNECT_FOUR_MOVES = ["4", "4", "3", "5", "5", "3", "2", "6", "6", "2", "1", "7", "7", "1", "4", "4"]
+TIC_TAC_TOE_MOVES = ["b2", "a1", "c3", "a3", "a2", "c2"]
+
+
+def quiet(game):
+    game.events = QUIET
+    return game
+
+
+def chess_game(moves):
+    game = quiet(ChessGame(500, "white"))
+    for move in moves:
+        if not game.play_move(move):
+            raise ValueError(f"Benchmark position move '{move}' was rejected")
+    return game
+
+
+def replay(game_class, color, moves):
+    game = quiet(game_class(500, color))
+    for move in moves:
+        game.play_move(move)
+    return game
+
+
+def chess_play_move():
+    # Setup plus 20 validated opening moves
+    chess_game(OPENING)
+
+
+def chess_is_in_check():
+    game = chess_game(CHESS_POSITIONS["check"])
+
+    def run():
+        game.is_in_check(1)
+        game.is_in_check(2)
+    return run
+
+
+def chess_find_checkmate(position, player):
+    # The full escape search, bypassing the transposition table
+    game = chess_game(CHESS_POSITIONS[position])
+    if position == "mate":
+        game.make_move(*_squares("d8-h4"))
+    return lambda: game._find_checkmate(player)
+
+
+def chess_is_in_checkmate():
+    # The cached path as play_move uses it: a transposition-table hit after the first call
+    game = chess_game(CHESS_POSITIONS["check"])
+    return lambda: game.is_in_checkmate(2)
+
+
+def chess_legal_moves():
+    game = chess_game(CHESS_POSITIONS["opening"])
+    return lambda: game._generate_legal_moves()
+
+
+def chess_perft(position, depth):
+    # Whole move tree below a standard position; timed per node, the engine's headline throughput
+    game = ChessGame.from_fen(POSITIONS[position][0])
+    return lambda: perft(game, depth)
+
+
+def connect_four_check_win(game_class):
+    game = replay(game_class, "red", CONNECT_FOUR_MOVES)
+    return lambda: game._check_win(2, 3, "R")
+
+
+def tic_tac_toe_check_win():
+    game = replay(TicTacToeGame, "x", TIC_TAC_TOE_MOVES)
+    return lambda: game._check_win("X")
+
+
+def formatted_gamelog(entries):
+    # Logging a long game move by move and reading the formatted log after every move, as players do
+    def run():
+        game = quiet(TicTacToeGame(entries, "x"))
+        for i in range(entries):
+            game.record_move(f"X{i}")
+            game.formatted_gamelog
+    return run
+
+
+def formatted_gamelog_rebuild(entries):
+    game = quiet(TicTacToeGame(entries, "x"))
+    for i in range(entries):
+        game.record_move(f"X{i}")
+
+    def run():
+        game._reset_gamelog_text()
+        game.formatted_gamelog
+    return run
+
+
+def player_get_move(player_class, game):
+    # The whole AIPlayer.get_move path (snapshot, prompt, schema, parsing) against a scripted model
+    colors = type(game).get_default_colors()
+    player = player_class(game.current_player, colors[game.current_player - 1], "bench", backend=FakeBackend())
+    player.events = QUIET
+    player.backend = FakeBackend(script=[{"move": player.encode_move(game.legal_moves()[0])}])
+    return lambda: player.get_move(game.snapshot())
+
+
+def _squares(move):
+    start, end = move.split("-")
+    return SQUARE_INDEX[start], SQUARE_INDEX[end]
+
+
+def build_cases():
+    # name -> (setup, operations per call); setup returns the callable to time, or is timed itself
+    return {
+        "chess.play_move[opening x20]": (lambda: chess_play_move, 20),
+        "chess.is_in_check": (chess_is_in_check, 2),
+        "chess.is_in_checkmate[cached]": (chess_is_in_checkmate, 1),
+        "chess.find_checkmate[check]": (lambda: chess_find_checkmate("check", 2), 1),
+        "chess.find_checkmate[mate]": (lambda: chess_find_checkmate("mate", 1), 1),
+        "chess.legal_moves[opening]": (chess_legal_moves, 1),
+        "chess.perft[initial d3]": (lambda: chess_perft("initial", 3), POSITIONS["initial"][1][2]),
+        "connectfour.check_win": (lambda: connect_four_check_win(ConnectFourGame), 1),
+        "connectfour.check_win[bitboard]": (lambda: connect_four_check_win(BitboardConnectFourGame), 1),
+        "tictactoe.check_win": (tic_tac_toe_check_win, 1),
+        "gamelog.formatted[200 moves]": (lambda: formatted_gamelog(200), 200),
+        "gamelog.rebuild[200 moves]": (lambda: formatted_gamelog_rebuild(200), 1),
+        "player.get_move[chess]": (lambda: player_get_move(ChessAIPlayer, chess_game(OPENING)), 1),
+        "player.get_move[connectfour]": (
+            lambda: player_get_move(ConnectFourAIPlayer, replay(ConnectFourGame, "red", CONNECT_FOUR_MOVES)), 1),
+        "player.get_move[tictactoe]": (
+            lambda: player_get_move(TicTacToeAIPlayer, replay(TicTacToeGame, "x", TIC_TAC_TOE_MOVES[:4])), 1),
+    }
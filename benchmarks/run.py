@@ -0,0 +1,196 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from .cases import build_cases
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def measure(func, ops, min_time=0.5, repeats=7, reference=None):
+    # Calibrates a loop count that runs for about min_time / repeats, then takes the per-op time of
+    # each repeat; the median is the headline number, the minimum the least noisy one.
+    # With a reference workload, every repeat is paired with one of the reference right before it:
+    # "relative" is the median ratio of the pairs, which cancels the machine's speed and its load.
+    # The garbage collector is paused while timing, as timeit does.
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _measure(func, ops, min_time, repeats, reference)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _loop_count(func, target):
+    loops = 1
+    while True:
+        if _time_loops(func, loops) >= target or loops >= 1 << 20:
+            return loops
+        loops *= 2
+
+
+def _time_loops(func, loops):
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - started
+
+
+def _measure(func, ops, min_time, repeats, reference):
+    loops = _loop_count(func, min_time / repeats)
+    reference_loops = _loop_count(reference, min_time / repeats) if reference else 0
+
+    samples = []
+    ratios = []
+    reference_samples = []
+    for _ in range(repeats):
+        if reference:
+            reference_samples.append(_time_loops(reference, reference_loops) / reference_loops)
+        samples.append(_time_loops(func, loops) / (loops * ops))
+        if reference:
+            ratios.append(samples[-1] / reference_samples[-1])
+
+    result = {
+        "median_ns": statistics.median(samples) * 1e9,
+        "min_ns": min(samples) * 1e9,
+        "ops_per_sec": 1 / statistics.median(samples),
+        "loops": loops,
+        "repeats": repeats,
+    }
+    if reference:
+        result["calibration_ns"] = min(reference_samples) * 1e9
+        result["relative"] = statistics.median(ratios)
+    return result
+
+
+def calibration():
+    # Fixed pure-Python workload, timed alongside every case: dict and list indexing, small-int arithmetic
+    # and function calls, the same mix as the engine hot paths. Its time says how fast this machine and
+    # interpreter are, so reports from different machines compare relative to it.
+    board = [(index * 7) % 5 for index in range(64)]
+    weights = {value: value * 3 + 1 for value in range(5)}
+
+    def score(square):
+        return weights[board[square]] - (square & 7)
+
+    def workload():
+        total = 0
+        for square in range(64):
+            if board[square]:
+                total += score(square)
+        return total
+
+    return workload
+
+
+def run(selected=None, min_time=0.5, repeats=7):
+    results = {}
+    for name, (setup, ops) in build_cases().items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        results[name] = measure(setup(), ops, min_time, repeats, reference=calibration())
+        print(f"{name:<36} {results[name]['median_ns']:>14,.0f} ns/op {results[name]['ops_per_sec']:>14,.0f} ops/s",
+              file=sys.stderr)
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def _python_minor(version):
+    return ".".join(version.split(".")[:2])
+
+
+def environment_mismatch(report, baseline):
+    # Calibration absorbs the speed of the machine, not a different interpreter version or architecture,
+    # which change the cases by different amounts; returns why the two reports do not compare, or None
+    mismatches = []
+    if _python_minor(report["python"]) != _python_minor(baseline.get("python", "")):
+        mismatches.append(f"Python {baseline.get('python')} vs {report['python']}")
+    if report["machine"] != baseline.get("machine"):
+        mismatches.append(f"{baseline.get('machine')} vs {report['machine']}")
+    return ", ".join(mismatches) or None
+
+
+def compare(report, baseline, threshold):
+    # A case regresses when its time relative to the calibration loop is more than threshold (0.25 = 25%)
+    # above the baseline's, which keeps baselines usable across machines of the same architecture
+    regressions = []
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            print(f"{name:<36} new, no baseline", file=sys.stderr)
+            continue
+        if "relative" not in reference:
+            print(f"{name:<36} baseline has no calibration time, save a new one", file=sys.stderr)
+            continue
+        change = result["relative"] / reference["relative"] - 1
+        status = "REGRESSED" if change > threshold else "ok"
+        print(f"{name:<36} {change * 100:>+8.1f}%  {status}", file=sys.stderr)
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the game engines' hot paths.")
+    parser.add_argument("cases", nargs="*", help="Only run cases whose name contains one of these")
+    parser.add_argument("--output", help="Write the results as JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before failing")
+    parser.add_argument("--ignore-environment", action="store_true",
+                        help="Compare even if the baseline was taken with another Python version or architecture")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Approximate seconds spent per case")
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    report = run(args.cases, args.min_time, args.repeats)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    mismatch = environment_mismatch(report, baseline)
+    if mismatch and not args.ignore_environment:
+        print(f"Not comparing: the baseline was taken in another environment ({mismatch}). Save a baseline "
+              f"here with --save-baseline, or pass --ignore-environment", file=sys.stderr)
+        return 2
+    if mismatch:
+        print(f"Comparing across environments ({mismatch}); expect differences unrelated to the code",
+              file=sys.stderr)
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold * 100:.0f}%: "
+              f"{', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,11 @@
 from .gameregistry import GameRegistry
 from .game.chess import ChessGame
 from .game.tictactoe import TicTacToeGame
-from .game.connectfour import ConnectFourGame
+from .game.connectfour import ConnectFourGame, BitboardConnectFourGame
 
 GameRegistry.register("chess", ChessGame)
 GameRegistry.register("tic tac toe", TicTacToeGame)
 GameRegistry.register("connect four", ConnectFourGame)
+GameRegistry.register("connect four bitboard", BitboardConnectFourGame)
 
 __all__ = ["GameRegistry"]
\ No newline at end of file
@@ -0,0 +1,69 @@
+from .base import BackendError, ModelBackend, ModelResponse
+from .batching import BatchingBackend
+from .fake import FakeBackend
+from .ollama_backend import OllamaBackend
+from .openai_backend import OpenAIBackend
+from .router import Endpoint, RoutedBackend
+
+
+class BackendRegistry:
+    _backends = {}
+
+    @classmethod
+    def register(cls, name, factory):
+        cls._backends[name.lower()] = factory
+
+    @classmethod
+    def get_backend(cls, name):
+        return cls._backends.get(name.lower())
+
+    @classmethod
+    def get_all_backends(cls):
+        return list(cls._backends.keys())
+
+
+def _parse_params(text):
+    params = {}
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        try:
+            params[key.strip()] = float(value) if "." in value else int(value)
+        except ValueError:
+            params[key.strip()] = value
+    return params
+
+
+BackendRegistry.register("ollama", lambda arg: OllamaBackend(host=arg or None))
+BackendRegistry.register("openai", lambda arg: OpenAIBackend(base_url=arg) if arg else OpenAIBackend())
+BackendRegistry.register("fake", lambda arg: FakeBackend(**_parse_params(arg)))
+
+_shared_backends = {}
+
+
+def create_backend(spec):
+    # "ollama", "ollama:http://gpu1:11434", "openai:http://gpu2:8000/v1", "fake:latency=0.05,error_rate=0.1"
+    if isinstance(spec, ModelBackend):
+        return spec
+
+    name, _, arg = (spec or "ollama").partition(":")
+    factory = BackendRegistry.get_backend(name)
+    if factory is None:
+        raise ValueError(f"Unknown backend '{name}' (known: {', '.join(BackendRegistry.get_all_backends())})")
+    return factory(arg)
+
+
+def get_backend(spec=None):
+    # Shared instance per spec, so every player talking to the same server shares its connection pool
+    if isinstance(spec, ModelBackend):
+        return spec
+    spec = spec or "ollama"
+    backend = _shared_backends.get(spec)
+    if backend is None:
+        backend = _shared_backends.setdefault(spec, create_backend(spec))
+    return backend
+
+
+__all__ = [
+    "BackendError", "ModelBackend", "ModelResponse", "BatchingBackend", "FakeBackend", "OllamaBackend", "OpenAIBackend",
+    "Endpoint", "RoutedBackend", "BackendRegistry", "create_backend", "get_backend",
+]
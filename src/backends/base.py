@@ -0,0 +1,62 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackendError(Exception):
+    pass
+
+
+class ModelResponse:
+    # Backend-neutral chat reply: the generated text plus whatever timing/token counters the backend reports
+    __slots__ = ("content", "metrics")
+
+    def __init__(self, content, metrics=None):
+        self.content = content
+        self.metrics = metrics or {}
+
+    def __repr__(self):
+        return f"ModelResponse({self.content!r})"
+
+
+class ModelBackend(ABC):
+    @abstractmethod
+    def chat(self, model, messages, format=None, options=None):
+        raise NotImplementedError
+
+    async def achat(self, model, messages, format=None, options=None):
+        return await asyncio.to_thread(self.chat, model, messages, format, options)
+
+    def stream_chat(self, model, messages, format=None, options=None):
+        # Yields the reply as ModelResponse pieces while it is generated; the server's counters come in the
+        # metrics of the piece that carries them, usually the last. Closing the generator early aborts
+        # the generation; backends that cannot stream deliver the whole reply as one piece.
+        yield self.chat(model, messages, format, options)
+
+    async def astream_chat(self, model, messages, format=None, options=None):
+        yield await self.achat(model, messages, format, options)
+
+    def chat_batch(self, model, requests):
+        # requests: [(messages, format, options), ...] -> one ModelResponse or exception per request.
+        # The default sends them in parallel, which servers that batch internally (Ollama with
+        # OLLAMA_NUM_PARALLEL, vLLM, ...) turn into one batched generation.
+        def call(request):
+            try:
+                return self.chat(model, *request)
+            except Exception as e:
+                return e
+
+        if len(requests) == 1:
+            return [call(requests[0])]
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            return list(executor.map(call, requests))
+
+    async def achat_batch(self, model, requests):
+        return await asyncio.gather(*(self.achat(model, *request) for request in requests), return_exceptions=True)
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        # Closes the clients this backend opened for the running event loop
+        pass
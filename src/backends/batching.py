@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+from .base import ModelBackend, ModelResponse
+
+
+class BatchingBackend(ModelBackend):
+    # Collects concurrent requests for the same model for up to max_wait seconds (or until
+    # max_batch_size are waiting) and hands them to the inner backend's chat_batch in one go,
+    # then fans the replies back out to the callers.
+    def __init__(self, inner, max_batch_size=8, max_wait=0.01):
+        self.inner = inner
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._async_pending = {}
+        self._tasks = set()
+
+    @property
+    def average_batch_size(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def stats(self):
+        return {"batches": self.batches, "requests": self.requests, "average_batch_size": self.average_batch_size}
+
+    def _count(self, size):
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+
+    @staticmethod
+    def _resolve(batch, replies, dispatched):
+        for (_, waiter, enqueued), reply in zip(batch, replies):
+            if waiter.done():
+                continue
+            if isinstance(reply, BaseException):
+                waiter.set_exception(reply)
+            else:
+                if isinstance(reply, ModelResponse):
+                    reply.metrics["queue_seconds"] = reply.metrics.get("queue_seconds", 0.0) + dispatched - enqueued
+                waiter.set_result(reply)
+
+    def chat(self, model, messages, format=None, options=None):
+        waiter = Future()
+        flush_now = False
+
+        with self._lock:
+            batch = self._pending.get(model)
+            if batch is None:
+                batch = self._pending[model] = []
+                timer = threading.Timer(self.max_wait, self._flush, args=(model, batch))
+                timer.daemon = True
+                timer.start()
+            batch.append(((messages, format, options), waiter, time.perf_counter()))
+            if len(batch) >= self.max_batch_size:
+                flush_now = True
+
+        if flush_now:
+            self._flush(model, batch)
+        return waiter.result()
+
+    def _flush(self, model, batch):
+        # Called by the timer and by the caller that fills the batch; whichever comes first sends it
+        with self._lock:
+            if self._pending.get(model) is not batch:
+                return
+            del self._pending[model]
+
+        self._count(len(batch))
+        requests = [request for request, _, _ in batch]
+        dispatched = time.perf_counter()
+        try:
+            replies = self.inner.chat_batch(model, requests)
+        except Exception as e:
+            replies = [e] * len(batch)
+        self._resolve(batch, replies, dispatched)
+
+    async def achat(self, model, messages, format=None, options=None):
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        key = (loop, model)
+
+        batch = self._async_pending.get(key)
+        if batch is None:
+            batch = self._async_pending[key] = []
+            loop.call_later(self.max_wait, self._aflush, key, batch)
+        batch.append(((messages, format, options), waiter, time.perf_counter()))
+        if len(batch) >= self.max_batch_size:
+            self._aflush(key, batch)
+
+        return await waiter
+
+    def _aflush(self, key, batch):
+        if self._async_pending.get(key) is not batch:
+            return
+        del self._async_pending[key]
+
+        self._count(len(batch))
+        loop, model = key
+        requests = [request for request, _, _ in batch]
+        dispatched = time.perf_counter()
+
+        async def send():
+            try:
+                replies = await self.inner.achat_batch(model, requests)
+            except Exception as e:
+                replies = [e] * len(batch)
+            self._resolve(batch, replies, dispatched)
+
+        task = loop.create_task(send())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def chat_batch(self, model, requests):
+        return self.inner.chat_batch(model, requests)
+
+    async def achat_batch(self, model, requests):
+        return await self.inner.achat_batch(model, requests)
+
+    def close(self):
+        self.inner.close()
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    # Streamed replies cannot share one batched generation, so streams bypass the queue
+    def stream_chat(self, model, messages, format=None, options=None):
+        return self.inner.stream_chat(model, messages, format, options)
+
+    def astream_chat(self, model, messages, format=None, options=None):
+        return self.inner.astream_chat(model, messages, format, options)
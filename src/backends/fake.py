@@ -0,0 +1,140 @@
+import asyncio
+import json
+import random
+import threading
+import time
+
+from .base import BackendError, ModelBackend, ModelResponse
+
+
+def sample_pattern(pattern, rng=random):
+    # Generates a random string for the simple patterns used by the players' response schemas,
+    # i.e. literals and [...] character classes, optionally followed by '?'
+    pattern = pattern.strip("^$")
+    result = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "[":
+            end = pattern.index("]", i)
+            body = pattern[i + 1:end]
+            choices = []
+            j = 0
+            while j < len(body):
+                if j + 2 < len(body) and body[j + 1] == "-":
+                    choices.extend(chr(c) for c in range(ord(body[j]), ord(body[j + 2]) + 1))
+                    j += 3
+                else:
+                    choices.append(body[j])
+                    j += 1
+            token = rng.choice(choices)
+            i = end + 1
+        else:
+            token = pattern[i]
+            i += 1
+
+        if i < len(pattern) and pattern[i] == "?":
+            i += 1
+            if rng.random() < 0.5:
+                continue
+        result.append(token)
+    return "".join(result)
+
+
+def sample_schema(schema, rng=random):
+    # Builds a JSON object that satisfies a players' response schema
+    response = {}
+    for key, prop in (schema or {}).get("properties", {}).items():
+        if "enum" in prop:
+            response[key] = rng.choice(prop["enum"])
+        elif "pattern" in prop:
+            response[key] = sample_pattern(prop["pattern"], rng)
+        else:
+            response[key] = ""
+    return response
+
+
+class FakeBackend(ModelBackend):
+    # In-process stand-in for a model: answers with scripted replies or random schema-valid moves,
+    # after an optional simulated latency, failing a configurable fraction of calls.
+    # Lets tournaments run without a model server and measures the arena's own overhead.
+    def __init__(self, latency=0.0, error_rate=0.0, seed=None, script=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.script = script
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _reply(self, model, messages, format):
+        with self._lock:
+            self.calls += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                raise BackendError(f"Simulated failure from fake model '{model}'")
+            if callable(self.script):
+                content = self.script(model, messages, format)
+            elif self.script:
+                content = self.script[(self.calls - 1) % len(self.script)]
+            else:
+                content = sample_schema(format, self._rng)
+
+        if not isinstance(content, str):
+            content = json.dumps(content)
+
+        metrics = {
+            "prompt_eval_count": sum(len(m["content"]) for m in messages) // 4,
+            "eval_count": len(content) // 4 + 1,
+            "total_duration": int(self.latency * 1e9),
+        }
+        return ModelResponse(content, metrics)
+
+    def chat(self, model, messages, format=None, options=None):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(model, messages, format)
+
+    async def achat(self, model, messages, format=None, options=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(model, messages, format)
+
+    # Streams spread the latency over 4-character pieces, like tokens arriving during generation;
+    # the counters come with the last piece, as Ollama sends them
+    def _pieces(self, reply):
+        content = reply.content
+        pieces = [ModelResponse(content[i:i + 4]) for i in range(0, len(content), 4)] or [ModelResponse("")]
+        pieces[-1].metrics = reply.metrics
+        return pieces, self.latency / len(pieces)
+
+    def stream_chat(self, model, messages, format=None, options=None):
+        pieces, delay = self._pieces(self._reply(model, messages, format))
+        for piece in pieces:
+            if delay:
+                time.sleep(delay)
+            yield piece
+
+    async def astream_chat(self, model, messages, format=None, options=None):
+        pieces, delay = self._pieces(self._reply(model, messages, format))
+        for piece in pieces:
+            if delay:
+                await asyncio.sleep(delay)
+            yield piece
+
+    def _batch_replies(self, model, requests):
+        replies = []
+        for messages, format, options in requests:
+            try:
+                replies.append(self._reply(model, messages, format))
+            except BackendError as e:
+                replies.append(e)
+        return replies
+
+    # A batch costs one latency period, like a server generating all sequences together
+    def chat_batch(self, model, requests):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._batch_replies(model, requests)
+
+    async def achat_batch(self, model, requests):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._batch_replies(model, requests)
@@ -0,0 +1,72 @@
+import asyncio
+
+from ollama import Client, AsyncClient
+
+from .base import ModelBackend, ModelResponse
+
+METRIC_FIELDS = [
+    "total_duration", "load_duration", "prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration",
+]
+
+
+class OllamaBackend(ModelBackend):
+    def __init__(self, host=None, **client_kwargs):
+        self.host = host
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._async_clients = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = Client(host=self.host, **self.client_kwargs)
+        return self._client
+
+    def async_client(self):
+        # One pooled keep-alive client per event loop, shared by every player on this host
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncClient(host=self.host, **self.client_kwargs)
+            self._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _to_response(response):
+        metrics = {field: getattr(response, field, None) for field in METRIC_FIELDS}
+        return ModelResponse(response.message.content, {k: v for k, v in metrics.items() if v is not None})
+
+    def chat(self, model, messages, format=None, options=None):
+        response = self.client.chat(model=model, messages=messages, format=format, options=options, stream=False)
+        return self._to_response(response)
+
+    async def achat(self, model, messages, format=None, options=None):
+        response = await self.async_client().chat(model=model, messages=messages, format=format, options=options,
+                                                  stream=False)
+        return self._to_response(response)
+
+    def stream_chat(self, model, messages, format=None, options=None):
+        stream = self.client.chat(model=model, messages=messages, format=format, options=options, stream=True)
+        try:
+            for chunk in stream:
+                yield self._to_response(chunk)
+        finally:
+            stream.close()  # closes the HTTP response, which makes the server stop generating
+
+    async def astream_chat(self, model, messages, format=None, options=None):
+        stream = await self.async_client().chat(model=model, messages=messages, format=format, options=options,
+                                                stream=True)
+        try:
+            async for chunk in stream:
+                yield self._to_response(chunk)
+        finally:
+            await stream.aclose()
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+
+    async def aclose(self):
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import httpx
+
+from .base import BackendError, ModelBackend, ModelResponse
+
+
+class OpenAIBackend(ModelBackend):
+    # Any server speaking the OpenAI chat completions API (vLLM, llama.cpp server, LM Studio, ...)
+    def __init__(self, base_url="http://localhost:8000/v1", api_key=None, timeout=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.timeout = timeout
+        self._client = None
+        self._async_clients = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = httpx.Client(base_url=self.base_url, headers=self.headers, timeout=self.timeout)
+        return self._client
+
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=self.timeout)
+            self._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _payload(model, messages, format, options):
+        payload = {"model": model, "messages": messages}
+        if format:
+            # Strict mode rejects object schemas that allow extra properties, so only closed ones ask for it
+            strict = format.get("additionalProperties") is False
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "move", "schema": format, "strict": strict},
+            }
+        for key, value in (options or {}).items():
+            # Ollama-style option names map onto the top-level OpenAI sampling parameters
+            payload["max_tokens" if key == "num_predict" else key] = value
+        return payload
+
+    @staticmethod
+    def _usage_metrics(body):
+        usage = body.get("usage") or {}
+        metrics = {
+            "prompt_eval_count": usage.get("prompt_tokens"),
+            "eval_count": usage.get("completion_tokens"),
+        }
+        return {k: v for k, v in metrics.items() if v is not None}
+
+    @classmethod
+    def _to_response(cls, response):
+        if response.status_code >= 400:
+            raise BackendError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        body = response.json()
+        return ModelResponse(body["choices"][0]["message"]["content"], cls._usage_metrics(body))
+
+    @classmethod
+    def _stream_chunk(cls, line):
+        # Server-sent event line -> ModelResponse piece, or None for keep-alives and the final [DONE].
+        # The usage chunk that include_usage asks for has no choices, only the token counts.
+        if not line.startswith("data:"):
+            return None
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return None
+        body = json.loads(data)
+        choices = body.get("choices") or [{}]
+        content = choices[0].get("delta", {}).get("content") or ""
+        metrics = cls._usage_metrics(body)
+        if not content and not metrics:
+            return None
+        return ModelResponse(content, metrics)
+
+    @classmethod
+    def _stream_payload(cls, model, messages, format, options):
+        # include_usage adds a last chunk with the token counts, which streams otherwise leave out
+        return {**cls._payload(model, messages, format, options), "stream": True,
+                "stream_options": {"include_usage": True}}
+
+    def chat(self, model, messages, format=None, options=None):
+        response = self.client.post("/chat/completions", json=self._payload(model, messages, format, options))
+        return self._to_response(response)
+
+    async def achat(self, model, messages, format=None, options=None):
+        response = await self.async_client().post("/chat/completions",
+                                                  json=self._payload(model, messages, format, options))
+        return self._to_response(response)
+
+    def stream_chat(self, model, messages, format=None, options=None):
+        payload = self._stream_payload(model, messages, format, options)
+        with self.client.stream("POST", "/chat/completions", json=payload) as response:
+            if response.status_code >= 400:
+                response.read()
+                self._to_response(response)
+            for line in response.iter_lines():
+                chunk = self._stream_chunk(line)
+                if chunk is not None:
+                    yield chunk
+
+    async def astream_chat(self, model, messages, format=None, options=None):
+        payload = self._stream_payload(model, messages, format, options)
+        async with self.async_client().stream("POST", "/chat/completions", json=payload) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                self._to_response(response)
+            async for line in response.aiter_lines():
+                chunk = self._stream_chunk(line)
+                if chunk is not None:
+                    yield chunk
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+
+    async def aclose(self):
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
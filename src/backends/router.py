@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+
+from .base import BackendError, ModelBackend
+
+
+class Endpoint:
+    # One serving box for a model: caps in-flight requests and trips a circuit breaker after
+    # failure_threshold consecutive failures. While open, the endpoint gets no traffic for
+    # cooldown seconds; after that a single trial request decides whether it closes again.
+    def __init__(self, backend, name=None, max_concurrency=4, failure_threshold=3, cooldown=30.0):
+        self.backend = backend
+        self.name = name or repr(backend)
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.outstanding = 0
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_slots = {}
+
+    def available(self, now):
+        if self.opened_at is None:
+            return True
+        return now - self.opened_at >= self.cooldown and not self.trial_in_flight
+
+    def load(self):
+        return self.outstanding / self.max_concurrency
+
+    def _begin(self):
+        with self._lock:
+            if self.opened_at is not None:
+                self.trial_in_flight = True
+            self.outstanding += 1
+            self.requests += 1
+
+    def _end(self, ok):
+        with self._lock:
+            self.outstanding -= 1
+            self.trial_in_flight = False
+            if ok is None:
+                return  # cancelled by the caller, says nothing about the endpoint's health
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.errors += 1
+                self.failures += 1
+                if self.failures >= self.failure_threshold or self.opened_at is not None:
+                    self.opened_at = time.monotonic()
+
+    def async_slots(self):
+        loop = asyncio.get_running_loop()
+        slots = self._async_slots.get(loop)
+        if slots is None:
+            slots = self._async_slots.setdefault(loop, asyncio.Semaphore(self.max_concurrency))
+        return slots
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "open": self.opened_at is not None,
+        }
+
+
+class RoutedBackend(ModelBackend):
+    # Maps each model to a pool of endpoints and sends every request to the available endpoint
+    # with the fewest outstanding requests (relative to its concurrency cap). A failed request is
+    # retried once on each other endpoint of the pool before the error is raised.
+    def __init__(self, routes, default=None):
+        self.routes = routes
+        self.default = default or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_specs(cls, routes, default=None, **endpoint_kwargs):
+        # routes: {"model": ["ollama:http://gpu1:11434", "ollama:http://gpu2:11434"]}
+        from . import get_backend
+
+        def pool(specs):
+            return [Endpoint(get_backend(spec), name=spec, **endpoint_kwargs) for spec in specs]
+
+        return cls({model: pool(specs) for model, specs in routes.items()}, pool(default or []))
+
+    def pool(self, model):
+        endpoints = self.routes.get(model) or self.default
+        if not endpoints:
+            raise BackendError(f"No endpoints configured for model '{model}'")
+        return endpoints
+
+    def _choose(self, model, exclude):
+        # Requests waiting for a slot count as outstanding, so queues spread across the pool
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self.pool(model) if e not in exclude and e.available(now)]
+            if not candidates:
+                return None
+            endpoint = min(candidates, key=Endpoint.load)
+            endpoint._begin()
+            return endpoint
+
+    def chat(self, model, messages, format=None, options=None):
+        tried = []
+        last_error = None
+        while (endpoint := self._choose(model, tried)) is not None:
+            tried.append(endpoint)
+            waited = time.perf_counter()
+            with endpoint._slots:
+                queued = time.perf_counter() - waited
+                try:
+                    response = endpoint.backend.chat(model, messages, format, options)
+                except Exception as e:
+                    endpoint._end(ok=False)
+                    last_error = e
+                    continue
+                except BaseException:
+                    endpoint._end(ok=None)
+                    raise
+                endpoint._end(ok=True)
+                response.metrics["queue_seconds"] = response.metrics.get("queue_seconds", 0.0) + queued
+                return response
+        raise BackendError(f"All endpoints failed or are ejected for model '{model}'") from last_error
+
+    async def achat(self, model, messages, format=None, options=None):
+        tried = []
+        last_error = None
+        while (endpoint := self._choose(model, tried)) is not None:
+            tried.append(endpoint)
+            waited = time.perf_counter()
+            async with endpoint.async_slots():
+                queued = time.perf_counter() - waited
+                try:
+                    response = await endpoint.backend.achat(model, messages, format, options)
+                except Exception as e:
+                    endpoint._end(ok=False)
+                    last_error = e
+                    continue
+                except BaseException:
+                    endpoint._end(ok=None)
+                    raise
+                endpoint._end(ok=True)
+                response.metrics["queue_seconds"] = response.metrics.get("queue_seconds", 0.0) + queued
+                return response
+        raise BackendError(f"All endpoints failed or are ejected for model '{model}'") from last_error
+
+    # Streams go to one endpoint without failover: once text has been handed out, a restart elsewhere
+    # could not be merged into it. Abandoning a stream early counts as neither success nor failure.
+    def stream_chat(self, model, messages, format=None, options=None):
+        endpoint = self._choose(model, [])
+        if endpoint is None:
+            raise BackendError(f"All endpoints are ejected for model '{model}'")
+        with endpoint._slots:
+            ok = None
+            try:
+                yield from endpoint.backend.stream_chat(model, messages, format, options)
+                ok = True
+            except Exception:
+                ok = False
+                raise
+            finally:
+                endpoint._end(ok=ok)
+
+    async def astream_chat(self, model, messages, format=None, options=None):
+        endpoint = self._choose(model, [])
+        if endpoint is None:
+            raise BackendError(f"All endpoints are ejected for model '{model}'")
+        async with endpoint.async_slots():
+            ok = None
+            try:
+                async for chunk in endpoint.backend.astream_chat(model, messages, format, options):
+                    yield chunk
+                ok = True
+            except Exception:
+                ok = False
+                raise
+            finally:
+                endpoint._end(ok=ok)
+
+    def stats(self):
+        pools = dict(self.routes)
+        if self.default:
+            pools["*"] = self.default
+        return {model: [endpoint.stats() for endpoint in endpoints] for model, endpoints in pools.items()}
+
+    def _endpoints(self):
+        endpoints = {id(endpoint): endpoint for pool in self.routes.values() for endpoint in pool}
+        endpoints.update((id(endpoint), endpoint) for endpoint in self.default)
+        return list(endpoints.values())
+
+    def close(self):
+        for endpoint in self._endpoints():
+            endpoint.backend.close()
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        for endpoint in self._endpoints():
+            endpoint._async_slots.pop(loop, None)
+            await endpoint.backend.aclose()
@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from .backends import BatchingBackend, RoutedBackend, get_backend
+from .events import SINKS, create_sink
+from .gameregistry import GameRegistry
+from .ratings import print_leaderboard
+from .resultstore import ResultStore
+from .responsecache import ResponseCache
+from .retry import RetryPolicy
+from .schedule import TournamentSchedule
+from .telemetry import Telemetry
+from .tournament import LLMTournament
+
+DEFAULTS = {
+    "game": None,
+    "models": None,
+    "max_turns": 50,
+    "games_per_pair": 2,
+    "workers": 1,
+    "output": "tournament_results.json",
+    "host": None,
+    "backend": None,
+    "backends": None,
+    "routes": None,
+    "endpoint_concurrency": 4,
+    "batch_size": 1,
+    "batch_wait": 0.01,
+    "temperature": None,
+    "max_errors": 5,
+    "backoff": 0.5,
+    "max_backoff": 30.0,
+    "game_retry_budget": None,
+    "model_retry_budget": None,
+    "move_timeout": None,
+    "timeouts": None,
+    "timeout_fallback": "forfeit",
+    "stream": False,
+    "events": "terminal",
+    "telemetry": None,
+    "metrics": None,
+    "cache": None,
+    "cache_sampled": False,
+    "tournament_id": None,
+    "shard": None,
+    "resume": False,
+    "use_async": False,
+}
+
+
+def parse_shard(value):
+    # "i/N" -> (i, N), 0 <= i < N
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must look like i/N, got '{value}'")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Shard index must be in 0..N-1, got '{value}'")
+    return index, count
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run LLM tournaments without interactive prompts.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run a round-robin tournament (or one shard of it)")
+    run.add_argument("--config", help="JSON file with any of the options below; flags override it")
+    run.add_argument("--game", choices=GameRegistry.get_all_games())
+    run.add_argument("--models", help="Comma separated model names")
+    run.add_argument("--max-turns", type=int)
+    run.add_argument("--games-per-pair", type=int)
+    run.add_argument("--workers", type=int, help="Games to play at the same time")
+    run.add_argument("--output", help="Results summary path; the match log is written next to it")
+    run.add_argument("--host", help="Ollama host, when no --backend is given")
+    run.add_argument("--backend", help="Default model backend, e.g. ollama:http://gpu1:11434, "
+                                       "openai:http://gpu2:8000/v1 or fake:latency=0.05,error_rate=0.1")
+    run.add_argument("--endpoint-concurrency", type=int,
+                     help="Max in-flight requests per endpoint when the config has 'routes'")
+    run.add_argument("--batch-size", type=int, help="Max concurrent move requests sent to a model together")
+    run.add_argument("--batch-wait", type=float, help="Seconds to wait for a batch to fill")
+    run.add_argument("--temperature", type=float)
+    run.add_argument("--max-errors", type=int, help="Failed attempts in a row before a player forfeits the turn")
+    run.add_argument("--backoff", type=float, help="Base delay in seconds before retrying after a backend error")
+    run.add_argument("--max-backoff", type=float, help="Upper bound of the retry delay")
+    run.add_argument("--game-retry-budget", type=int, help="Max retries per game, both players together")
+    run.add_argument("--model-retry-budget", type=int, help="Max retries per model over the whole run")
+    run.add_argument("--move-timeout", type=float,
+                     help="Seconds a model may take for one move; the config's 'timeouts' sets it per model")
+    run.add_argument("--timeout-fallback", choices=["forfeit", "random"],
+                     help="What happens when a move times out: the turn is forfeited or a random legal move is played")
+    run.add_argument("--stream", action="store_true", default=None,
+                     help="Stream replies and stop each generation as soon as the move is complete")
+    run.add_argument("--events", choices=sorted(SINKS),
+                     help="Game output: boards on the terminal, buffered log lines, or nothing")
+    run.add_argument("--telemetry", help="Append a JSONL record per move request and per saved game to this file")
+    run.add_argument("--metrics", help="Write per-model latency histograms and token rates here (Prometheus text)")
+    run.add_argument("--cache", help="Path of a response cache database to use")
+    run.add_argument("--cache-sampled", action="store_true", default=None,
+                     help="Also cache replies sampled at a non-zero temperature (replays them on later runs)")
+    run.add_argument("--tournament-id", help="Shared schedule id; give every shard the same one")
+    run.add_argument("--shard", type=parse_shard, help="Play only shard i of N (e.g. 0/4)")
+    run.add_argument("--resume", action="store_true", default=None, help="Resume the schedule in --output")
+    run.add_argument("--async", dest="use_async", action="store_true", default=None,
+                     help="Play games on one event loop instead of worker threads")
+
+    merge = subparsers.add_parser("merge", help="Merge shard results into one store")
+    merge.add_argument("inputs", nargs="+", help="Results summary paths of the shards")
+    merge.add_argument("--output", required=True)
+
+    ratings = subparsers.add_parser("ratings", help="Recompute ratings from the whole match log")
+    ratings.add_argument("results", help="Results summary path")
+    ratings.add_argument("--period", type=int, help="Games per Glicko-2 rating period")
+    ratings.add_argument("--save", action="store_true", help="Store the recomputed ratings in the summary")
+
+    return parser
+
+
+def load_settings(args):
+    settings = dict(DEFAULTS)
+
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        unknown = set(config) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        settings.update(config)
+
+    for key in DEFAULTS:
+        value = getattr(args, key, None)
+        if value is not None:
+            settings[key] = value
+
+    if isinstance(settings["models"], str):
+        settings["models"] = [m.strip() for m in settings["models"].split(",") if m.strip()]
+    if isinstance(settings["shard"], str):
+        settings["shard"] = parse_shard(settings["shard"])
+
+    if not settings["game"] or not GameRegistry.is_valid_game(settings["game"]):
+        raise ValueError("A valid --game is required")
+    if not settings["models"] or len(settings["models"]) < 2:
+        raise ValueError("Need at least 2 models for tournament!")
+    if settings["shard"] and not settings["tournament_id"]:
+        raise ValueError("--shard needs a --tournament-id shared by all shards")
+    if settings["cache"] and settings["temperature"] != 0 and not settings["cache_sampled"]:
+        # The cache only keeps temperature 0 replies, so it would silently store and serve nothing
+        raise ValueError("--cache only stores replies sampled at --temperature 0; "
+                         "set it, or pass --cache-sampled to cache sampled replies too")
+
+    return settings
+
+
+def run(settings):
+    options = None
+    if settings["temperature"] is not None:
+        options = {"temperature": settings["temperature"]}
+
+    cache = None
+    if settings["cache"]:
+        cache = ResponseCache(settings["cache"], deterministic_only=not settings["cache_sampled"])
+
+    if settings["events"] == "log":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    events = create_sink(settings["events"])
+    telemetry = Telemetry(settings["telemetry"]) if settings["telemetry"] or settings["metrics"] else None
+
+    backend = settings["backend"]
+    if settings["routes"]:
+        # {"model": [backend specs...], "*": [default pool]} spreads each model over several servers
+        routes = dict(settings["routes"])
+        default_pool = routes.pop("*", None)
+        backend = RoutedBackend.from_specs(routes, default_pool or ([backend] if backend else None),
+                                           max_concurrency=settings["endpoint_concurrency"])
+
+    backends = settings["backends"]
+    if settings["batch_size"] > 1:
+        def batched(spec):
+            return BatchingBackend(get_backend(spec or (f"ollama:{settings['host']}" if settings["host"] else None)),
+                                   max_batch_size=settings["batch_size"], max_wait=settings["batch_wait"])
+
+        backend = batched(backend)
+        backends = {model: batched(spec) for model, spec in (backends or {}).items()}
+
+    tournament = LLMTournament(
+        game_name=settings["game"],
+        llm_models=settings["models"],
+        max_turns=settings["max_turns"],
+        games_per_pair=settings["games_per_pair"],
+        results_file=settings["output"],
+        workers=settings["workers"],
+        host=settings["host"],
+        backend=backend,
+        backends=backends,
+        options=options,
+        cache=cache,
+        resume=settings["resume"],
+        tournament_id=settings["tournament_id"],
+        shard=settings["shard"],
+        retry_policy=RetryPolicy(
+            max_consecutive_errors=settings["max_errors"],
+            base_delay=settings["backoff"],
+            max_delay=settings["max_backoff"],
+            game_budget=settings["game_retry_budget"],
+            model_budget=settings["model_retry_budget"],
+        ),
+        move_timeout=settings["move_timeout"],
+        timeouts=settings["timeouts"],
+        timeout_fallback=settings["timeout_fallback"],
+        stream=settings["stream"],
+        events=events,
+        telemetry=telemetry,
+    )
+
+    if settings["use_async"]:
+        asyncio.run(tournament.arun_tournament())
+    else:
+        tournament.run_tournament()
+
+    tournament.print_summary()
+    print(f"Results saved to: {tournament.results_file}")
+    if settings["metrics"]:
+        telemetry.write_prometheus(settings["metrics"])
+        print(f"Metrics written to: {settings['metrics']}")
+    return tournament
+
+
+def merge(inputs, output):
+    # Deterministic merge: records are de-duplicated by game id and ordered by schedule position,
+    # so merging the same shards always yields the same log and summary whatever their order
+    records = {}
+    for path in inputs:
+        for record in ResultStore(path).records():
+            records.setdefault(record["game_id"], record)
+
+    store = ResultStore(output)
+    if store.summary["games_played"]:
+        raise ValueError(f"Merge output '{output}' already contains results")
+
+    store.extend(records[game_id] for game_id in sorted(records, key=TournamentSchedule.sort_key))
+    store.save_summary()
+    print(f"Merged {len(records)} games from {len(inputs)} stores into {output}")
+    return store
+
+
+def ratings(results, period=None, save=False):
+    # Bulk recompute over the full history: maximum-likelihood Elo and Glicko-2 over rating periods
+    store = ResultStore(results)
+    started = time.perf_counter()
+    table = store.recompute_ratings(period)
+    elapsed = time.perf_counter() - started
+
+    print_leaderboard(table.leaderboard())
+    print(f"\nRated {store.summary['games_played']} games in {elapsed:.3f}s")
+
+    if save:
+        store.save_summary()
+        print(f"Ratings saved to: {results}")
+    return table
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "merge":
+            merge(args.inputs, args.output)
+        elif args.command == "ratings":
+            ratings(args.results, args.period, args.save)
+        else:
+            run(load_settings(args))
+    except (ValueError, OSError) as e:
+        parser.exit(2, f"error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
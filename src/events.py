@@ -0,0 +1,148 @@
+import logging
+import sys
+import threading
+import time
+
+MATCH_STARTED = "match_started"
+MOVE_PLAYED = "move_played"
+INVALID_MOVE = "invalid_move"
+CHECK = "check"
+GAME_OVER = "game_over"
+MODEL_CALL_STARTED = "model_call_started"
+MODEL_CALL_FINISHED = "model_call_finished"
+MODEL_ERROR = "model_error"
+TURN_FORFEITED = "turn_forfeited"
+FALLBACK_MOVE = "fallback_move"
+GAME_FAILED = "game_failed"
+TOURNAMENT_RESUMED = "tournament_resumed"
+
+
+class EventSink:
+    # Receives structured events from games, players and tournaments. emit() gets the event kind,
+    # the object that raised it and plain fields; turning them into text is left to the sink, so
+    # a sink that ignores an event costs nothing beyond the call.
+    def emit(self, kind, source, **fields):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class NullSink(EventSink):
+    # For headless runs: drops everything
+    def emit(self, kind, source, **fields):
+        pass
+
+
+class BufferedLogSink(EventSink):
+    # Queues events as tuples and writes them to a logger in batches, one key=value line per event.
+    # Boards are never rendered; the source is logged by class name.
+    def __init__(self, logger=None, level=logging.INFO, flush_size=256):
+        self.logger = logger or logging.getLogger("llmarena")
+        self.level = level
+        self.flush_size = flush_size
+        self.buffer = []
+        self._lock = threading.Lock()
+
+    def emit(self, kind, source, **fields):
+        with self._lock:
+            self.buffer.append((time.time(), kind, type(source).__name__, fields))
+            full = len(self.buffer) >= self.flush_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events, self.buffer = self.buffer, []
+
+        if not self.logger.isEnabledFor(self.level):
+            return
+        for timestamp, kind, source, fields in events:
+            details = " ".join(f"{key}={value}" for key, value in fields.items())
+            self.logger.log(self.level, "%.3f %s %s %s", timestamp, kind, source, details)
+
+
+class TerminalSink(EventSink):
+    # Renders events as the human-readable lines the games used to print, boards included.
+    # Each event is written in one go, so lines from concurrent games do not interleave.
+    def __init__(self, stream=None):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, kind, source, **fields):
+        render = getattr(self, f"_render_{kind}", None)
+        if render is None:
+            return
+        text = render(source, **fields)
+        if text is not None:
+            with self._lock:
+                print(text, file=self.stream or sys.stdout)
+
+    @staticmethod
+    def _render_match_started(source, game_id, model1, model2):
+        return f"Game {game_id}: {model1} vs {model2}"
+
+    @staticmethod
+    def _render_move_played(source, player, move, label=None):
+        return f"Player {player} plays: {label or move}\n{source}"
+
+    @staticmethod
+    def _render_invalid_move(source, player, move, reason):
+        return reason
+
+    @staticmethod
+    def _render_check(source, player):
+        return f"Check! Player {player} is in check."
+
+    @staticmethod
+    def _render_game_over(source, winner, reason, color=None):
+        if reason == "checkmate":
+            return f"Checkmate! {color} wins!"
+        if reason == "repetition":
+            return "Threefold repetition! Game is a draw."
+        if winner is not None:
+            return f"Player {winner} ({color}) wins!"
+        return "Game is a draw!"
+
+    @staticmethod
+    def _render_model_call_started(source, player, color, model):
+        return f"AI Player {player} ({color}) is thinking..."
+
+    @staticmethod
+    def _render_model_error(source, game_id, player, model, error):
+        return f"Error from player {player}: {error}"
+
+    @staticmethod
+    def _render_turn_forfeited(source, game_id, player, model, attempts):
+        return f"Game {game_id}: player {player} ({model}) forfeits the turn after {attempts} failed attempts"
+
+    @staticmethod
+    def _render_fallback_move(source, game_id, player, model, move):
+        return f"Game {game_id}: playing random move {move} for player {player} ({model})"
+
+    @staticmethod
+    def _render_game_failed(source, game_id, error):
+        return f"Game {game_id} failed: {error}"
+
+    @staticmethod
+    def _render_tournament_resumed(source, tournament_id, remaining, total):
+        return f"Resuming tournament {tournament_id}: {remaining} of {total} games left"
+
+
+# Default for games and players created outside a tournament, e.g. by the interactive controller
+TERMINAL = TerminalSink()
+
+SINKS = {
+    "terminal": TerminalSink,
+    "log": BufferedLogSink,
+    "null": NullSink,
+}
+
+
+def create_sink(name):
+    if name not in SINKS:
+        raise ValueError(f"Unknown event sink '{name}' (known: {', '.join(SINKS)})")
+    return SINKS[name]()
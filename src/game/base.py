@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
 
+from .state import GameState, MoveHistory
+from ..events import TERMINAL
+
 
 class Game(ABC):
+    # Where move, check and game-over events go; a tournament replaces it per game
+    events = TERMINAL
+
     def __init__(self, max_turns, player_color, board_size):
         self.max_turns = max_turns
         self.turn_count = 0
@@ -12,6 +18,14 @@ class Game(ABC):
         self.winner = None
         self.game_over = False
         self.gamelog = []
+        # formatted_gamelog is formatted lazily: a read appends only the moves logged since the last one.
+        # _gamelog_ends[i] is where entry i ends in the text, so undoing moves trims it instead.
+        self._gamelog_text = ""
+        self._gamelog_count = 0
+        self._gamelog_ends = []
+        # Set while snapshot histories share gamelog; it is then replaced instead of shortened in place
+        self._gamelog_shared = False
+        self._legal_moves_cache = {}
 
     @abstractmethod
     def initialize_game(self):
@@ -25,21 +39,94 @@ class Game(ABC):
     def play_move(self, move):
         pass
 
+    @abstractmethod
+    def position_key(self):
+        # Hashable identity of the position, including whose turn it is
+        pass
+
+    @abstractmethod
+    def _generate_legal_moves(self):
+        pass
+
+    def legal_moves(self):
+        # Moves the player to move may play, in the same notation play_move accepts
+        key = self.position_key()
+        moves = self._legal_moves_cache.get(key)
+        if moves is None:
+            moves = self._legal_moves_cache[key] = tuple(self._generate_legal_moves())
+        return moves
+
+    @abstractmethod
+    def board_snapshot(self):
+        # Immutable copy of the board for GameState
+        pass
+
+    def snapshot(self):
+        self._gamelog_shared = True
+        return GameState(
+            board=self.board_snapshot(),
+            legal_moves=self.legal_moves(),
+            player=self.current_player,
+            turn=self.turn_count,
+            history=MoveHistory(self.gamelog),
+            formatted_gamelog=self.formatted_gamelog,
+            position_key=self.position_key(),
+        )
+
+    def record_move(self, entry):
+        self.gamelog.append(entry)
+
+    def undo_log(self, count=1):
+        self.truncate_log(len(self.gamelog) - count)
+
+    def truncate_log(self, length):
+        if self._gamelog_shared and length < len(self.gamelog):
+            self.gamelog = self.gamelog[:length]
+            self._gamelog_shared = False
+        else:
+            del self.gamelog[length:]
+        if self._gamelog_count > length:
+            self._gamelog_text = self._gamelog_text[:self._gamelog_ends[length - 1]] if length else ""
+            del self._gamelog_ends[length:]
+            self._gamelog_count = length
+
+    def _reset_gamelog_text(self):
+        self._gamelog_text = ""
+        self._gamelog_count = 0
+        self._gamelog_ends = []
+
+    @staticmethod
+    def _format_entry(index, entry):
+        # Player 1's moves start a numbered line; the trailing space is where player 2's move goes
+        if index % 2:
+            return entry
+        if index:
+            return f"\n{index // 2 + 1}. {entry} "
+        return f"1. {entry} "
+
     @property
     def formatted_gamelog(self):
-        counter = 1
-        formatted_gamelog = []
-        for i in range(0, len(self.gamelog), 2):
-            player1move = self.gamelog[i]
-            if i + 1 < len(self.gamelog):
-                player2move = self.gamelog[i + 1]
+        gamelog = self.gamelog
+        count = len(gamelog)
+        done = self._gamelog_count
+        if done != count:
+            if done > count:
+                # gamelog was shortened directly instead of through truncate_log
+                self._reset_gamelog_text()
+                done = 0
+            ends = self._gamelog_ends
+            if count - done == 1:
+                self._gamelog_text += self._format_entry(done, gamelog[done])
+                ends.append(len(self._gamelog_text))
             else:
-                player2move = ""
-            formatted_gamelog.append(f"{counter}. {player1move} {player2move}")
-            counter += 1
-
-        formatted_gamelog = "\n".join(formatted_gamelog)
-        return formatted_gamelog
+                pieces = [self._format_entry(i, gamelog[i]) for i in range(done, count)]
+                end = len(self._gamelog_text)
+                for piece in pieces:
+                    end += len(piece)
+                    ends.append(end)
+                self._gamelog_text += "".join(pieces)
+            self._gamelog_count = count
+        return self._gamelog_text
 
     @classmethod
     @abstractmethod
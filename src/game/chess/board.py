@@ -0,0 +1,83 @@
+from collections.abc import Mapping
+
+from .movegen import SQUARES, SQUARE_INDEX
+from .pieces import PIECES, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK
+
+BACK_RANK = [ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK]
+
+
+def initial_squares():
+    squares = bytearray(64)
+    for i, piece_type in enumerate(BACK_RANK):
+        squares[i] = piece_type | WHITE
+        squares[8 + i] = PAWN | WHITE
+        squares[48 + i] = PAWN | BLACK
+        squares[56 + i] = piece_type | BLACK
+    return squares
+
+
+FEN_PIECES = {"p": PAWN, "n": KNIGHT, "b": BISHOP, "r": ROOK, "q": QUEEN, "k": KING}
+
+
+def parse_fen(fen):
+    # Piece placement and side to move of a FEN string. Castling rights, en passant target and the
+    # move counters are ignored, since the engine implements none of those rules.
+    fields = fen.split()
+    ranks = fields[0].split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"FEN '{fen}' must describe 8 ranks")
+
+    squares = bytearray(64)
+    for rank_index, rank in enumerate(ranks):
+        sq = (7 - rank_index) * 8
+        end = sq + 8
+        for char in rank:
+            if char.isdigit():
+                sq += int(char)
+            elif char.lower() in FEN_PIECES:
+                if sq < end:
+                    squares[sq] = FEN_PIECES[char.lower()] | (WHITE if char.isupper() else BLACK)
+                sq += 1
+            else:
+                raise ValueError(f"FEN '{fen}' has an unknown piece '{char}'")
+        if sq != end:
+            raise ValueError(f"FEN '{fen}' rank '{rank}' does not have 8 squares")
+
+    side = fields[1] if len(fields) > 1 else "w"
+    if side not in ("w", "b"):
+        raise ValueError(f"FEN '{fen}' has an unknown side to move '{side}'")
+    return squares, "white" if side == "w" else "black"
+
+
+class BoardView(Mapping):
+    # Read-only dict view ("e4" -> Piece) over the 64-byte board, for rendering and prompt builders
+    __slots__ = ("squares",)
+
+    def __init__(self, squares):
+        self.squares = squares
+
+    def __getitem__(self, name):
+        sq = SQUARE_INDEX.get(name)
+        if sq is None or not self.squares[sq]:
+            raise KeyError(name)
+        return PIECES[self.squares[sq]]
+
+    def get(self, name, default=None):
+        sq = SQUARE_INDEX.get(name)
+        if sq is None or not self.squares[sq]:
+            return default
+        return PIECES[self.squares[sq]]
+
+    def __contains__(self, name):
+        sq = SQUARE_INDEX.get(name)
+        return sq is not None and self.squares[sq] != 0
+
+    def __iter__(self):
+        squares = self.squares
+        return (SQUARES[sq] for sq in range(64) if squares[sq])
+
+    def __len__(self):
+        return 64 - self.squares.count(0)
+
+    def __repr__(self):
+        return repr(dict(self))
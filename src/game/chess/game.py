@@ -1,11 +1,18 @@
-from copy import deepcopy
-
+from .board import BoardView, initial_squares, parse_fen
 from .cells import ChessCell
-from .pieces import Pawn, Rook, Knight, Bishop, Queen, King
+from .movegen import SQUARES, SQUARE_INDEX, pseudo_legal_moves, is_square_attacked
+from .pieces import Pawn, PIECES, KING, WHITE, BLACK, TYPE_MASK, COLOR_MASK, COLOR_BITS
+from .transposition import TranspositionTable
+from .zobrist import PIECE_KEYS, SIDE_KEYS, hash_squares
 from ..base import Game
+from ...events import MOVE_PLAYED, INVALID_MOVE, CHECK, GAME_OVER
 
 
 class ChessGame(Game):
+    # Shared by every game in the process; keys include the side to move
+    transposition_table = TranspositionTable()
+    legal_moves_table = TranspositionTable()
+
     def __init__(self, max_turns, player_color):
         super().__init__(
             max_turns=max_turns,
@@ -13,6 +20,31 @@ class ChessGame(Game):
             board_size=8,
         )
         self.captured_pieces = {"white": [], "black": []}
+        self._index_position()
+
+    @classmethod
+    def from_squares(cls, squares, to_move="white", max_turns=500):
+        # A game starting from an arbitrary position, e.g. a perft test position, with white as player 1
+        game = cls(max_turns, "white")
+        game.squares[:] = squares
+        game.current_player = 1 if to_move == "white" else 2
+        game._index_position()
+        return game
+
+    @classmethod
+    def from_fen(cls, fen, max_turns=500):
+        squares, to_move = parse_fen(fen)
+        return cls.from_squares(squares, to_move, max_turns)
+
+    def _index_position(self):
+        # King squares, hash and repetition counts derived from self.squares
+        self.king_squares = {WHITE: None, BLACK: None}
+        for sq, piece in enumerate(self.squares):
+            if piece & TYPE_MASK == KING:
+                self.king_squares[piece & COLOR_MASK] = sq
+        self.position_hash = hash_squares(self.squares)
+        self.position_counts = {}
+        self._record_position()
 
     @classmethod
     def get_player_types(cls):
@@ -46,22 +78,34 @@ class ChessGame(Game):
         return board_repr + f"  {bottom_row}"
 
     def initialize_game(self):
-        pieces = {
-            "a1": Rook("white"), "b1": Knight("white"), "c1": Bishop("white"),
-            "d1": Queen("white"), "e1": King("white"), "f1": Bishop("white"),
-            "g1": Knight("white"), "h1": Rook("white"),
-            "a2": Pawn("white"), "b2": Pawn("white"), "c2": Pawn("white"),
-            "d2": Pawn("white"), "e2": Pawn("white"), "f2": Pawn("white"),
-            "g2": Pawn("white"), "h2": Pawn("white"),
-
-            "a7": Pawn("black"), "b7": Pawn("black"), "c7": Pawn("black"),
-            "d7": Pawn("black"), "e7": Pawn("black"), "f7": Pawn("black"),
-            "g7": Pawn("black"), "h7": Pawn("black"),
-            "a8": Rook("black"), "b8": Knight("black"), "c8": Bishop("black"),
-            "d8": Queen("black"), "e8": King("black"), "f8": Bishop("black"),
-            "g8": Knight("black"), "h8": Rook("black")
-        }
-        return pieces
+        # The position lives in a 64-byte array of piece codes; board_status is a lazy dict view of it
+        self.squares = initial_squares()
+        return BoardView(self.squares)
+
+    def legal_moves(self):
+        # Cached across games like checkmate verdicts, since openings repeat throughout a tournament
+        key = self.position_key()
+        moves = self.legal_moves_table.lookup(key)
+        if moves is None:
+            moves = tuple(self._generate_legal_moves())
+            self.legal_moves_table.store(key, moves)
+        return moves
+
+    def _generate_legal_moves(self):
+        return [f"{SQUARES[start]}-{SQUARES[end]}" for start, end in self.legal_move_pairs(self.current_player)]
+
+    def legal_move_pairs(self, player):
+        # (start, end) square indices of the pseudo-legal moves that do not leave the mover's king attacked
+        moves = []
+        for start, end in list(self.pseudo_legal_moves(player)):
+            captured = self.make_move(start, end)
+            if not self.is_in_check(player):
+                moves.append((start, end))
+            self.unmake_move(start, end, captured)
+        return moves
+
+    def board_snapshot(self):
+        return BoardView(bytes(self.squares))
 
     def log_move(self, piece, end_cell):
         if isinstance(piece, Pawn):
@@ -69,21 +113,18 @@ class ChessGame(Game):
         else:
             piece_initial = piece.piece_initial
 
-        self.gamelog.append(piece_initial + str(end_cell))
+        self.record_move(piece_initial + str(end_cell))
 
     def play_move(self, move):
         if not self._validate_move_format(move):
-            print(f"Move '{move}' is not valid!")
-            return False
+            return self._reject(move)
 
         start_cell_str, end_cell_str = move.split('-')
         start_cell = ChessCell(start_cell_str)
         end_cell = ChessCell(end_cell_str)
 
         if start_cell_str not in self.board_status:
-            print(f"Move '{move}' is not valid!")
-            print(f"No piece at {start_cell_str}!")
-            return False
+            return self._reject(move, f"No piece at {start_cell_str}!")
 
         piece = self.board_status[start_cell_str]
 
@@ -93,17 +134,12 @@ class ChessGame(Game):
             current_player_color = "black" if self.current_player == 1 else "white"
 
         if piece.color.lower() != current_player_color:
-            print(f"Move '{move}' is not valid!")
-            print(f"Player {self.current_player} can only move {current_player_color} pieces!")
-            return False
+            return self._reject(move, f"Player {self.current_player} can only move {current_player_color} pieces!")
 
         if end_cell_str in self.board_status:
             target_piece = self.board_status[end_cell_str]
             if target_piece.color == piece.color:
-                print(f"Move '{move}' is not valid!")
-                print(f"Cannot capture your own {target_piece}!")
-                return False
-            self.captured_pieces[target_piece.color].append(target_piece)
+                return self._reject(move, f"Cannot capture your own {target_piece}!")
             eating = True
         else:
             eating = False
@@ -111,19 +147,13 @@ class ChessGame(Game):
         if piece.piece_type != "knight":
             path = self._get_path(start_cell, end_cell)
             if path and not self._is_path_clear(path):
-                print(f"Move '{move}' is not valid!")
-                print(f"Path is blocked for {piece}!")
-                return False
+                return self._reject(move, f"Path is blocked for {piece}!")
 
         if not piece.move(start_cell, end_cell, eating=eating):
-            print(f"Move '{move}' is not valid!")
-            print(f"Invalid move for {piece}!")
-            return False
-
-        pre_move_status = deepcopy(self.board_status)
+            return self._reject(move, f"Invalid move for {piece}!")
 
-        self.board_status[end_cell_str] = piece
-        del self.board_status[start_cell_str]
+        start, end = SQUARE_INDEX[start_cell_str], SQUARE_INDEX[end_cell_str]
+        captured = self.make_move(start, end)
         if self.is_in_check(self.current_player):
             if self.is_in_checkmate(self.current_player):
                 winner = 2 if self.current_player == 1 else 1
@@ -131,17 +161,17 @@ class ChessGame(Game):
                                           (self.player_color == "black" and winner == 2) else "Black"
                 self.winner = winner
                 self.game_over = True
-                self.board_status = pre_move_status
-                print(f"Checkmate! {winner_color} wins!")
+                self.unmake_move(start, end, captured)
+                self.events.emit(GAME_OVER, self, winner=winner, reason="checkmate", color=winner_color)
                 return "win"
-            self.board_status = pre_move_status
-            print("Move leaves you in check!")
-            return False
+            self.unmake_move(start, end, captured)
+            return self._reject(move, "Move leaves you in check!")
 
-        piece.moved(start_cell, end_cell)
+        if captured:
+            captured_piece = PIECES[captured]
+            self.captured_pieces[captured_piece.color].append(captured_piece)
         self.log_move(piece, end_cell)
-        print(f"Player {self.current_player} plays: {move}")
-        print(str(self))
+        self.events.emit(MOVE_PLAYED, self, player=self.current_player, move=move)
 
         self.turn_count += 1
         next_player = 2 if self.current_player == 1 else 1
@@ -153,13 +183,23 @@ class ChessGame(Game):
                                           (self.player_color == "black" and winner == 2) else "Black"
                 self.winner = winner
                 self.game_over = True
-                print(f"Checkmate! {winner_color} wins!")
+                self.events.emit(GAME_OVER, self, winner=winner, reason="checkmate", color=winner_color)
                 return "win"
-            print(f"Check! Player {next_player} is in check.")
+            self.events.emit(CHECK, self, player=next_player)
 
         self.current_player = next_player
+
+        if self._record_position() >= 3:
+            self.game_over = True
+            self.events.emit(GAME_OVER, self, winner=None, reason="repetition")
+
         return True
 
+    def _reject(self, move, reason=None):
+        message = f"Move '{move}' is not valid!" if reason is None else f"Move '{move}' is not valid! {reason}"
+        self.events.emit(INVALID_MOVE, self, player=self.current_player, move=move, reason=message)
+        return False
+
     def _get_path(self, start: ChessCell, end: ChessCell):
         path = []
         di, dj = end.dist(start)
@@ -202,97 +242,82 @@ class ChessGame(Game):
 
         return True
 
-    def is_in_check(self, player):
-        player_color = "white" if self.player_color == "white" and player == 1 else "black"
-        player_color = "black" if self.player_color == "white" and player == 2 else player_color
-        player_color = "white" if self.player_color == "black" and player == 2 else player_color
-        player_color = "black" if self.player_color == "black" and player == 1 else player_color
-
-        king_position = None
-        for pos, piece in self.board_status.items():
-            if piece.piece_type == "king" and piece.color == player_color:
-                king_position = pos
-                break
-
-        if not king_position:
-            return False
-
-        opponent_color = "black" if player_color == "white" else "white"
-        king_cell = ChessCell(king_position)
-
-        for pos, piece in self.board_status.items():
-            if piece.color != opponent_color:
-                continue
+    def _color_of(self, player):
+        if self.player_color == "white":
+            return "white" if player == 1 else "black"
+        return "black" if player == 1 else "white"
+
+    def _color_bit(self, player):
+        return COLOR_BITS[self._color_of(player)]
+
+    def make_move(self, start, end):
+        # Reversible move on square indices; no validation. Returns the captured piece code for unmake_move.
+        squares = self.squares
+        piece = squares[start]
+        captured = squares[end]
+        squares[end] = piece
+        squares[start] = 0
+        self.position_hash ^= PIECE_KEYS[piece][start] ^ PIECE_KEYS[piece][end] ^ PIECE_KEYS[captured][end]
+
+        if piece & TYPE_MASK == KING:
+            self.king_squares[piece & COLOR_MASK] = end
+        if captured & TYPE_MASK == KING:
+            self.king_squares[captured & COLOR_MASK] = None
+
+        return captured
+
+    def unmake_move(self, start, end, captured):
+        squares = self.squares
+        piece = squares[end]
+        squares[start] = piece
+        squares[end] = captured
+        self.position_hash ^= PIECE_KEYS[piece][start] ^ PIECE_KEYS[piece][end] ^ PIECE_KEYS[captured][end]
+
+        if piece & TYPE_MASK == KING:
+            self.king_squares[piece & COLOR_MASK] = start
+        if captured & TYPE_MASK == KING:
+            self.king_squares[captured & COLOR_MASK] = end
+
+    def position_key(self, player=None):
+        # Zobrist hash of the position with the given side (default: the player to move) to move
+        color = self._color_bit(self.current_player if player is None else player)
+        return self.position_hash ^ SIDE_KEYS[color]
+
+    def _record_position(self):
+        key = self.position_key()
+        self.position_counts[key] = self.position_counts.get(key, 0) + 1
+        return self.position_counts[key]
+
+    def pseudo_legal_moves(self, player):
+        return pseudo_legal_moves(self.squares, self._color_bit(player))
 
-            start_cell = ChessCell(pos)
+    def is_in_check(self, player):
+        color = self._color_bit(player)
+        king_square = self.king_squares[color]
 
-            if piece.piece_type == "knight":
-                if piece.move(start_cell, king_cell, eating=True):
-                    return True
-            else:
-                if piece.move(start_cell, king_cell, eating=True):
-                    path = self._get_path(start_cell, king_cell)
-                    if self._is_path_clear(path):
-                        return True
+        if king_square is None:
+            return False
 
-        return False
+        return is_square_attacked(self.squares, king_square, color ^ COLOR_MASK)
 
     def is_in_checkmate(self, player):
+        key = self.position_key(player)
+        verdict = self.transposition_table.lookup(key)
+        if verdict is None:
+            verdict = self._find_checkmate(player)
+            self.transposition_table.store(key, verdict)
+        return verdict
+
+    def _find_checkmate(self, player):
         if not self.is_in_check(player):
             return False
 
-        player_color = "white" if self.player_color == "white" and player == 1 else "black"
-        player_color = "black" if self.player_color == "white" and player == 2 else player_color
-        player_color = "white" if self.player_color == "black" and player == 2 else player_color
-        player_color = "black" if self.player_color == "black" and player == 1 else player_color
-
-        for start_pos, piece in list(self.board_status.items()):
-            if piece.color != player_color:
-                continue
-
-            start_cell = ChessCell(start_pos)
-
-            for i in range(1, 9):
-                for j in range(1, 9):
-                    end_pos = f"{ChessCell.index_to_letter[i]}{j}"
-                    if end_pos == start_pos:
-                        continue
-
-                    end_cell = ChessCell(end_pos)
-
-                    eating = end_pos in self.board_status
+        for start, end in list(self.pseudo_legal_moves(player)):
+            captured = self.make_move(start, end)
+            still_in_check = self.is_in_check(player)
+            self.unmake_move(start, end, captured)
 
-                    if eating and self.board_status[end_pos].color == player_color:
-                        continue
-
-                    if piece.piece_type != "knight":
-                        path = self._get_path(start_cell, end_cell)
-                        if path and not self._is_path_clear(path):
-                            continue
-
-                    if not piece.move(start_cell, end_cell, eating=eating):
-                        continue
-
-                    pre_move_status = deepcopy(self.board_status)
-                    captured_piece = None
-
-                    if end_pos in self.board_status:
-                        captured_piece = self.board_status[end_pos]
-
-                    self.board_status[end_pos] = piece
-                    del self.board_status[start_pos]
-
-                    still_in_check = self.is_in_check(player)
-
-                    self.board_status = pre_move_status
-
-                    if not still_in_check:
-                        print(f"Escape move found: {start_pos}-{end_pos}")
-                        temp_board = deepcopy(self.board_status)
-                        temp_board[end_pos] = temp_board[start_pos]
-                        del temp_board[start_pos]
-
-                        return False
+            if not still_in_check:
+                return False
 
-        print("No escape moves found - checkmate!")
-        return True
\ No newline at end of file
+        return True
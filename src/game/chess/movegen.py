@@ -0,0 +1,136 @@
+from .pieces import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK, TYPE_MASK, COLOR_MASK
+
+FILES = "abcdefgh"
+SQUARES = [f"{FILES[sq % 8]}{sq // 8 + 1}" for sq in range(64)]
+SQUARE_INDEX = {name: sq for sq, name in enumerate(SQUARES)}
+
+KNIGHT_OFFSETS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+KING_OFFSETS = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+ORTHOGONAL_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+DIAGONAL_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+PAWN_DIRECTION = {WHITE: 1, BLACK: -1}
+
+
+def _step(sq, di, dj):
+    i, j = sq % 8 + di, sq // 8 + dj
+    if 0 <= i < 8 and 0 <= j < 8:
+        return j * 8 + i
+    return None
+
+
+def _jump_table(offsets):
+    return [[target for di, dj in offsets if (target := _step(sq, di, dj)) is not None] for sq in range(64)]
+
+
+def _ray_table(directions):
+    table = []
+    for sq in range(64):
+        rays = []
+        for di, dj in directions:
+            ray = []
+            target = _step(sq, di, dj)
+            while target is not None:
+                ray.append(target)
+                target = _step(target, di, dj)
+            if ray:
+                rays.append(ray)
+        table.append(rays)
+    return table
+
+
+KNIGHT_TARGETS = _jump_table(KNIGHT_OFFSETS)
+KING_TARGETS = _jump_table(KING_OFFSETS)
+ORTHOGONAL_RAYS = _ray_table(ORTHOGONAL_DIRECTIONS)
+DIAGONAL_RAYS = _ray_table(DIAGONAL_DIRECTIONS)
+
+# Squares a pawn of the given color attacks from each square
+PAWN_ATTACKS = {color: _jump_table([(-1, dj), (1, dj)]) for color, dj in PAWN_DIRECTION.items()}
+# Squares a pawn of the given color would have to stand on to attack each square
+PAWN_ATTACKERS = {color: _jump_table([(-1, -dj), (1, -dj)]) for color, dj in PAWN_DIRECTION.items()}
+
+
+def _sliding_targets(squares, sq, rays, color):
+    for ray in rays[sq]:
+        for target in ray:
+            occupant = squares[target]
+            if not occupant:
+                yield target
+                continue
+            if occupant & COLOR_MASK != color:
+                yield target
+            break
+
+
+def _pawn_targets(squares, sq, color):
+    direction = 8 if color == WHITE else -8
+    forward = sq + direction
+    if 0 <= forward < 64 and not squares[forward]:
+        yield forward
+        # A pawn still on its starting rank has never moved
+        if sq // 8 == (1 if color == WHITE else 6) and not squares[forward + direction]:
+            yield forward + direction
+
+    for target in PAWN_ATTACKS[color][sq]:
+        occupant = squares[target]
+        if occupant and occupant & COLOR_MASK != color:
+            yield target
+
+
+def piece_targets(squares, sq):
+    piece = squares[sq]
+    piece_type = piece & TYPE_MASK
+    color = piece & COLOR_MASK
+
+    if piece_type == PAWN:
+        yield from _pawn_targets(squares, sq, color)
+    elif piece_type == KNIGHT or piece_type == KING:
+        table = KNIGHT_TARGETS if piece_type == KNIGHT else KING_TARGETS
+        for target in table[sq]:
+            occupant = squares[target]
+            if not occupant or occupant & COLOR_MASK != color:
+                yield target
+    else:
+        if piece_type != BISHOP:
+            yield from _sliding_targets(squares, sq, ORTHOGONAL_RAYS, color)
+        if piece_type != ROOK:
+            yield from _sliding_targets(squares, sq, DIAGONAL_RAYS, color)
+
+
+def pseudo_legal_moves(squares, color):
+    # (start, end) square indices for every move that obeys piece movement, ignoring king safety
+    for start in range(64):
+        piece = squares[start]
+        if piece and piece & COLOR_MASK == color:
+            for target in piece_targets(squares, start):
+                yield start, target
+
+
+def is_square_attacked(squares, sq, by_color):
+    # Looks outward from the square instead of scanning every enemy piece
+    knight = KNIGHT | by_color
+    for source in KNIGHT_TARGETS[sq]:
+        if squares[source] == knight:
+            return True
+
+    king = KING | by_color
+    for source in KING_TARGETS[sq]:
+        if squares[source] == king:
+            return True
+
+    pawn = PAWN | by_color
+    for source in PAWN_ATTACKERS[by_color][sq]:
+        if squares[source] == pawn:
+            return True
+
+    queen = QUEEN | by_color
+    for rays, slider in ((ORTHOGONAL_RAYS, ROOK | by_color), (DIAGONAL_RAYS, BISHOP | by_color)):
+        for ray in rays[sq]:
+            for source in ray:
+                piece = squares[source]
+                if not piece:
+                    continue
+                if piece == slider or piece == queen:
+                    return True
+                break
+
+    return False
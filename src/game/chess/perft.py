@@ -0,0 +1,142 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .game import ChessGame
+from .movegen import SQUARES
+
+# Standard perft positions with their published node counts. The engine has no castling, en passant
+# or promotion, so only the depths at which none of those moves can occur yet are listed.
+POSITIONS = {
+    "initial": ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1", (20, 400, 8902, 197281)),
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", (14, 191)),
+    "position6": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  (46, 2079, 89890, 3894594)),
+}
+
+
+def _opponent(player):
+    return 2 if player == 1 else 1
+
+
+def perft(game, depth, player=None):
+    # Leaf nodes of the legal move tree below the position, found with make/unmake on the square array
+    if player is None:
+        player = game.current_player
+    if depth == 0:
+        return 1
+
+    moves = game.legal_move_pairs(player)
+    if depth == 1:
+        return len(moves)
+
+    opponent = _opponent(player)
+    nodes = 0
+    for start, end in moves:
+        captured = game.make_move(start, end)
+        nodes += perft(game, depth - 1, opponent)
+        game.unmake_move(start, end, captured)
+    return nodes
+
+
+def _perft_after(squares, to_move, start, end, depth):
+    # Process pool task: the subtree below one root move, on a game rebuilt from the raw position
+    game = ChessGame.from_squares(squares, to_move)
+    player = game.current_player
+    game.make_move(start, end)
+    return perft(game, depth - 1, _opponent(player))
+
+
+def divide(game, depth, processes=1):
+    # Node count below each root move, in legal move order; processes > 1 splits the root moves over a pool
+    if depth < 1:
+        raise ValueError("divide needs a depth of at least 1")
+
+    player = game.current_player
+    moves = game.legal_move_pairs(player)
+    names = [f"{SQUARES[start]}-{SQUARES[end]}" for start, end in moves]
+
+    if processes > 1 and depth > 1:
+        squares = bytes(game.squares)
+        to_move = game._color_of(player)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_perft_after, squares, to_move, start, end, depth) for start, end in moves]
+            counts = [future.result() for future in futures]
+    else:
+        counts = []
+        for start, end in moves:
+            captured = game.make_move(start, end)
+            counts.append(perft(game, depth - 1, _opponent(player)))
+            game.unmake_move(start, end, captured)
+
+    return dict(zip(names, counts))
+
+
+def run(fen, depth, processes=1):
+    # (node count, per-root-move counts, seconds taken) for a FEN position
+    game = ChessGame.from_fen(fen)
+    started = time.perf_counter()
+    counts = divide(game, depth, processes)
+    elapsed = time.perf_counter() - started
+    return sum(counts.values()), counts, elapsed
+
+
+def _nodes_per_second(nodes, seconds):
+    return nodes / seconds if seconds else 0.0
+
+
+def verify(max_depth=None, processes=1):
+    # Checks every standard position against its published counts; returns the mismatches
+    failures = []
+    for name, (fen, expected) in POSITIONS.items():
+        for depth, count in enumerate(expected, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+            nodes, _, elapsed = run(fen, depth, processes)
+            status = "ok" if nodes == count else f"FAILED (expected {count})"
+            print(f"{name:<10} depth {depth}: {nodes:>9} nodes  {elapsed:7.2f}s  "
+                  f"{_nodes_per_second(nodes, elapsed):>9.0f} nodes/s  {status}")
+            if nodes != count:
+                failures.append((name, depth, nodes, count))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count the chess positions reachable at a given depth.")
+    parser.add_argument("position", nargs="?", default="initial",
+                        help=f"One of {', '.join(POSITIONS)}, or a FEN string")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--divide", action="store_true", help="Print the node count below each root move")
+    parser.add_argument("--processes", type=int, default=1, help="Split the root moves over this many processes")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check all standard positions against their published counts, up to --depth")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        failures = verify(args.depth, args.processes)
+        if failures:
+            print(f"{len(failures)} perft count(s) did not match", file=sys.stderr)
+            return 1
+        return 0
+
+    fen = POSITIONS[args.position][0] if args.position in POSITIONS else args.position
+    nodes, counts, elapsed = run(fen, args.depth, args.processes)
+
+    if args.divide:
+        for move, count in counts.items():
+            print(f"{move}: {count}")
+        print()
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.3f}s ({_nodes_per_second(nodes, elapsed):.0f} nodes/s)")
+
+    if args.position in POSITIONS:
+        expected = POSITIONS[args.position][1]
+        if args.depth <= len(expected) and nodes != expected[args.depth - 1]:
+            print(f"Expected {expected[args.depth - 1]} nodes", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
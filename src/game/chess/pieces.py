@@ -1,13 +1,27 @@
 from abc import ABC
 from .cells import ChessCell
 
+# Small-int piece codes used by the array board: the low three bits hold the piece type,
+# bit 3 is set for black pieces and 0 marks an empty square.
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(1, 7)
+WHITE, BLACK = 0, 8
+TYPE_MASK = 7
+COLOR_MASK = 8
+COLOR_BITS = {"white": WHITE, "black": BLACK}
+COLOR_NAMES = {WHITE: "white", BLACK: "black"}
+
 
 class Piece(ABC):
+    __slots__ = ("color", "piece_type", "piece_initial", "_symbol", "code")
+    type_code = EMPTY
+
     def __init__(self, color: str, piece_type: str, symbol: dict[str, str], piece_initial: str):
         self.color = color
         self.piece_type = piece_type
         self.piece_initial = piece_initial
         self._symbol = symbol
+        self.code = self.type_code | COLOR_BITS[color]
 
     @property
     def symbol(self) -> str:
@@ -27,9 +41,15 @@ class Piece(ABC):
 
 
 class Pawn(Piece):
+    __slots__ = ()
+    type_code = PAWN
+
     def __init__(self, color):
         super().__init__(color, "pawn", {"black": "♟", "white": "♙"}, "P")
-        self.ever_moved = False
+
+    def ever_moved_from(self, start: ChessCell):
+        # Pawns never move backwards, so a pawn off its starting rank has moved
+        return start.j != (2 if self.color == "white" else 7)
 
     def move(self, start: ChessCell, end: ChessCell, **kwargs):
         distance_i, distance_j = end.dist(start)
@@ -43,18 +63,18 @@ class Pawn(Piece):
         else:
 
             if distance_i == 0:
-                if not self.ever_moved:
+                if not self.ever_moved_from(start):
                     return 0 < distance_j <= 2
                 else:
                     return distance_j == 1
             else:
                 return False
 
-    def moved(self, start: ChessCell, end: ChessCell, **kwargs):
-        self.ever_moved = True
-
 
 class Rook(Piece):
+    __slots__ = ()
+    type_code = ROOK
+
     def __init__(self, color):
         super().__init__(color, "rook", {"black": "♜", "white": "♖"}, "R")
 
@@ -65,6 +85,9 @@ class Rook(Piece):
 
 
 class Knight(Piece):
+    __slots__ = ()
+    type_code = KNIGHT
+
     def __init__(self, color):
         super().__init__(color, "knight", {"black": "♞", "white": "♘"}, "N")
 
@@ -76,6 +99,9 @@ class Knight(Piece):
 
 
 class Bishop(Piece):
+    __slots__ = ()
+    type_code = BISHOP
+
     def __init__(self, color):
         super().__init__(color, "bishop", {"black": "♝", "white": "♗"}, "B")
 
@@ -86,6 +112,9 @@ class Bishop(Piece):
 
 
 class Queen(Piece):
+    __slots__ = ()
+    type_code = QUEEN
+
     def __init__(self, color):
         super().__init__(color, "queen", {"black": "♛", "white": "♕"}, "Q")
 
@@ -96,12 +125,21 @@ class Queen(Piece):
 
 
 class King(Piece):
+    __slots__ = ()
+    type_code = KING
+
     def __init__(self, color):
         super().__init__(color, "king", {"black": "♚", "white": "♔"}, "K")
-        self.ever_moved = False
 
     def move(self, start: ChessCell, end: ChessCell, **kwargs):
         distance_i, distance_j = end.dist(start)
 
         return abs(distance_i) <= 1 and abs(distance_j) <= 1
 
+
+# Pieces carry no per-instance state, so one shared instance per code backs every board view
+PIECES = {
+    piece.code: piece
+    for piece_class in (Pawn, Knight, Bishop, Rook, Queen, King)
+    for piece in (piece_class("white"), piece_class("black"))
+}
@@ -6,11 +6,14 @@ class ChessHumanPlayer(HumanPlayer):
         super().__init__(player_number, color, player_prompt)
 
 class ChessAIPlayer(AIPlayer):
-    def __init__(self, player_number, color, model="gpt-oss:120b-cloud"):
+    def __init__(self, player_number, color, model="gpt-oss:120b-cloud", **kwargs):
         prompt_format = """
         Here is the game log of a chess game in algebraic notation:
         {formatted_gamelog}
 
+        Legal moves you can choose from:
+        {legal_moves}
+
         Decide the next move using long algebraic notation
 
         Respond ONLY with the move in JSON format.
@@ -26,25 +29,27 @@ class ChessAIPlayer(AIPlayer):
             },
             "required": [
                 "move",
-            ]
+            ],
+            "additionalProperties": False
         }
-        super().__init__(player_number, color, model, prompt_format, response_schema)
-
-    def get_move(self, game):
-        print(f"AI Player {self.player_number} ({self.color}) is thinking...")
+        super().__init__(player_number, color, model, prompt_format, response_schema, **kwargs)
 
-        if isinstance(game, str):
-            formatted_gamelog = game
-        else:
-            formatted_gamelog = game.formatted_gamelog
+    def build_prompt(self, state):
+        formatted_gamelog = state.formatted_gamelog
+        legal_moves = ", ".join(self.encode_move(move) for move in state.legal_moves)
 
         if len(formatted_gamelog) == 0:
-            message = f"You are playing the {self.color} pieces in a chess game. Decide the first move using long algebraic notation. Respond ONLY with the move in JSON format."
+            message = f"You are playing the {self.color} pieces in a chess game. Decide the first move using long algebraic notation. Legal moves: {legal_moves}. Respond ONLY with the move in JSON format."
         else:
-            message = self.prompt_format.format(color=self.color, formatted_gamelog=formatted_gamelog)
+            message = self.prompt_format.format(color=self.color, formatted_gamelog=formatted_gamelog,
+                                                legal_moves=legal_moves)
+
+        return message
 
-        move = self._prompt_model(message=message)
+    def encode_move(self, move):
+        return move.replace("-", "")
 
+    def format_move(self, move):
         if "x" in move or "-" in move:
             move = move[:-3]+move[-2:]
         return move[-4:-2] + "-" + move[-2:]
\ No newline at end of file
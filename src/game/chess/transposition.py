@@ -0,0 +1,56 @@
+class TranspositionTable:
+    # Fixed-size table of two-slot buckets. The first slot is depth-preferred: it only gives way to
+    # an entry searched at least as deep. The second slot is always replaced, so recent positions
+    # still get cached when the first slot is holding a deeper result.
+    def __init__(self, size=1 << 16):
+        self.size = 1 << max(0, size - 1).bit_length()
+        self.mask = self.size - 1
+        self.entries = [None] * (2 * self.size)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def lookup(self, key):
+        index = (key & self.mask) << 1
+        for slot in (index, index + 1):
+            entry = self.entries[slot]
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        return None
+
+    def store(self, key, value, depth=0):
+        index = (key & self.mask) << 1
+        entry = (key, depth, value)
+        preferred = self.entries[index]
+
+        if preferred is None or preferred[0] == key or depth >= preferred[1]:
+            slot = index
+        else:
+            slot = index + 1
+
+        if self.entries[slot] is not None and self.entries[slot][0] != key:
+            self.overwrites += 1
+        self.entries[slot] = entry
+        self.stores += 1
+
+    def clear(self):
+        self.entries = [None] * (2 * self.size)
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hit_rate,
+        }
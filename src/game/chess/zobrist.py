@@ -0,0 +1,16 @@
+import random
+
+# Fixed seed so position hashes are stable across processes and can be shared between runs
+_rng = random.Random(0x5A0B1157)
+
+# One key per (piece code, square); index 0 (empty) stays zero so captures of nothing are no-ops
+PIECE_KEYS = [[0] * 64 if code == 0 else [_rng.getrandbits(64) for _ in range(64)] for code in range(16)]
+SIDE_KEYS = {0: _rng.getrandbits(64), 8: _rng.getrandbits(64)}
+
+
+def hash_squares(squares):
+    key = 0
+    for sq, piece in enumerate(squares):
+        if piece:
+            key ^= PIECE_KEYS[piece][sq]
+    return key
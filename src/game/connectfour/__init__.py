@@ -1,4 +1,5 @@
 from .game import ConnectFourGame
+from .bitboard import BitboardConnectFourGame
 from .player import ConnectFourAIPlayer, ConnectFourHumanPlayer
 
-__all__ = ["ConnectFourGame", "ConnectFourAIPlayer", "ConnectFourHumanPlayer"]
\ No newline at end of file
+__all__ = ["ConnectFourGame", "BitboardConnectFourGame", "ConnectFourAIPlayer", "ConnectFourHumanPlayer"]
\ No newline at end of file
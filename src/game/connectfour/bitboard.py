@@ -0,0 +1,102 @@
+from copy import copy
+
+from ..base import Game
+from .game import ConnectFourGame
+
+
+class BitboardConnectFourGame(ConnectFourGame):
+    # Each column takes 7 bits: 6 playable rows plus an always-empty sentinel bit,
+    # so shifted lines never wrap from one column into the next. Bit 0 is the bottom of column 1.
+    COLUMN_BITS = 7
+    DIRECTIONS = (1, 7, 6, 8)  # vertical, horizontal, both diagonals
+
+    def _init_board(self):
+        self.bitboards = {"R": 0, "Y": 0}
+        self.heights = [column * self.COLUMN_BITS for column in range(self.columns)]
+        self.move_stack = []
+
+    @property
+    def board(self):
+        # Built on demand from the set bits only; callers should read it once per render
+        board = [[None] * self.columns for _ in range(self.rows)]
+        for symbol, bitboard in self.bitboards.items():
+            while bitboard:
+                low = bitboard & -bitboard
+                column, row = divmod(low.bit_length() - 1, self.COLUMN_BITS)
+                board[self.rows - 1 - row][column] = symbol
+                bitboard ^= low
+        return board
+
+    def _is_column_full(self, column):
+        return self.heights[column] == column * self.COLUMN_BITS + self.rows
+
+    def _is_board_full(self):
+        return len(self.move_stack) == self.rows * self.columns
+
+    def _drop_piece(self, column, symbol):
+        bit = self.heights[column]
+        self.move_stack.append((column, symbol, self.current_player, self.turn_count,
+                                self.game_over, self.winner, len(self.gamelog)))
+        self.bitboards[symbol] |= 1 << bit
+        self.heights[column] = bit + 1
+        return self.rows - 1 - (bit - column * self.COLUMN_BITS)
+
+    def _check_win(self, row, col, symbol):
+        return self.has_four(self.bitboards[symbol])
+
+    @classmethod
+    def has_four(cls, bitboard):
+        for shift in cls.DIRECTIONS:
+            pairs = bitboard & (bitboard >> shift)
+            if pairs & (pairs >> 2 * shift):
+                return True
+        return False
+
+    def position_key(self):
+        return self.current_player, self.bitboards["R"], self.bitboards["Y"]
+
+    # The bitboard key is three ints, so the cached lookup stays cheaper than rescanning the columns
+    legal_moves = Game.legal_moves
+
+    def legal_columns(self):
+        return [column for column in range(self.columns) if not self._is_column_full(column)]
+
+    def play_column(self, column):
+        # Quiet make-move for search and self-play: no validation, logging or printing.
+        # Column is 0-based and must not be full.
+        symbol = self._current_symbol()
+        self._drop_piece(column, symbol)
+
+        if self.has_four(self.bitboards[symbol]):
+            self.winner = self.current_player
+            self.game_over = True
+            return "win"
+
+        if self._is_board_full():
+            self.game_over = True
+            return True
+
+        self.turn_count += 1
+        self.current_player = 2 if self.current_player == 1 else 1
+        return True
+
+    def undo(self):
+        column, symbol, current_player, turn_count, game_over, winner, log_length = self.move_stack.pop()
+        self.heights[column] -= 1
+        self.bitboards[symbol] &= ~(1 << self.heights[column])
+        self.current_player = current_player
+        self.turn_count = turn_count
+        self.game_over = game_over
+        self.winner = winner
+        self.truncate_log(log_length)
+
+    def copy(self):
+        clone = copy(self)
+        clone.bitboards = dict(self.bitboards)
+        clone.heights = list(self.heights)
+        clone.move_stack = list(self.move_stack)
+        clone.gamelog = list(self.gamelog)
+        clone._gamelog_shared = False
+        clone._gamelog_ends = list(self._gamelog_ends)
+        clone.board_status = dict(self.board_status)
+        return clone
@@ -1,7 +1,10 @@
 from ..base import Game
+from ...events import MOVE_PLAYED, INVALID_MOVE, GAME_OVER
 
 
 class ConnectFourGame(Game):
+    COLUMN_LABELS = ("1", "2", "3", "4", "5", "6", "7")
+
     def __init__(self, max_turns, player_color):
         super().__init__(
             max_turns=max_turns,
@@ -10,7 +13,7 @@ class ConnectFourGame(Game):
         )
         self.columns = 7
         self.rows = 6
-        self.board = [[None for _ in range(self.columns)] for _ in range(self.rows)]
+        self._init_board()
 
         if player_color == "red":
             self.current_player = 1
@@ -32,11 +35,12 @@ class ConnectFourGame(Game):
 
     def __str__(self) -> str:
         board_repr = ""
+        board = self.board
 
         for row in range(self.rows):
             cur_row = ""
             for col in range(self.columns):
-                piece = self.board[row][col]
+                piece = board[row][col]
                 if piece is None:
                     cur_row += " ·"
                 elif piece == "R":
@@ -51,45 +55,61 @@ class ConnectFourGame(Game):
     def initialize_game(self):
         return {}
 
+    def _init_board(self):
+        self.board = [[None for _ in range(self.columns)] for _ in range(self.rows)]
+
+    def position_key(self):
+        return self.current_player, tuple(tuple(row) for row in self.board)
+
+    def _generate_legal_moves(self):
+        return [str(column + 1) for column in range(self.columns) if not self._is_column_full(column)]
+
+    def legal_moves(self):
+        # A column is open while its top cell is empty; scanning that row is cheaper than hashing the
+        # whole board into a position_key for the cache
+        return tuple([label for label, cell in zip(self.COLUMN_LABELS, self.board[0]) if cell is None])
+
+    def board_snapshot(self):
+        return tuple(tuple(row) for row in self.board)
+
     def log_move(self, column, symbol):
-        self.gamelog.append(f"{symbol}{column}")
+        self.record_move(f"{symbol}{column}")
 
     def play_move(self, move):
         if not self._validate_move_format(move):
-            print(f"Move '{move}' is not valid format!")
+            self.events.emit(INVALID_MOVE, self, player=self.current_player, move=move,
+                             reason=f"Move '{move}' is not valid format!")
             return False
 
         column = int(move) - 1
 
         if column < 0 or column >= self.columns:
-            print(f"Column {move} is out of range!")
+            self.events.emit(INVALID_MOVE, self, player=self.current_player, move=move,
+                             reason=f"Column {move} is out of range!")
             return False
 
-        if self.board[0][column] is not None:
-            print(f"Column {move} is full!")
+        if self._is_column_full(column):
+            self.events.emit(INVALID_MOVE, self, player=self.current_player, move=move,
+                             reason=f"Column {move} is full!")
             return False
 
-        current_symbol = "R" if self.current_player == 1 and self.player_color == "red" else "Y"
-        current_symbol = "Y" if self.current_player == 1 and self.player_color == "yellow" else current_symbol
-        current_symbol = "R" if self.current_player == 2 and self.player_color == "yellow" else current_symbol
-        current_symbol = "Y" if self.current_player == 2 and self.player_color == "red" else current_symbol
+        current_symbol = self._current_symbol()
 
         row = self._drop_piece(column, current_symbol)
         self.log_move(move, current_symbol)
 
-        print(f"Player {self.current_player} plays: Column {move}")
-        print(str(self))
+        self.events.emit(MOVE_PLAYED, self, player=self.current_player, move=move, label=f"Column {move}")
 
         if self._check_win(row, column, current_symbol):
             self.winner = self.current_player
             self.game_over = True
             color_name = "Red" if current_symbol == "R" else "Yellow"
-            print(f"Player {self.current_player} ({color_name}) wins!")
+            self.events.emit(GAME_OVER, self, winner=self.current_player, reason="win", color=color_name)
             return "win"
 
         if self._is_board_full():
             self.game_over = True
-            print("Game is a draw!")
+            self.events.emit(GAME_OVER, self, winner=None, reason="draw")
             return True
 
         self.turn_count += 1
@@ -107,6 +127,16 @@ class ConnectFourGame(Game):
 
         return True
 
+    def _current_symbol(self):
+        current_symbol = "R" if self.current_player == 1 and self.player_color == "red" else "Y"
+        current_symbol = "Y" if self.current_player == 1 and self.player_color == "yellow" else current_symbol
+        current_symbol = "R" if self.current_player == 2 and self.player_color == "yellow" else current_symbol
+        current_symbol = "Y" if self.current_player == 2 and self.player_color == "red" else current_symbol
+        return current_symbol
+
+    def _is_column_full(self, column):
+        return self.board[0][column] is not None
+
     def _drop_piece(self, column, symbol):
         for row in range(self.rows - 1, -1, -1):
             if self.board[row][column] is None:
@@ -25,7 +25,7 @@ class ConnectFourHumanPlayer(HumanPlayer):
 
 
 class ConnectFourAIPlayer(AIPlayer):
-    def __init__(self, player_number, color, model="gpt-oss:120b-cloud"):
+    def __init__(self, player_number, color, model="gpt-oss:120b-cloud", **kwargs):
         prompt_format = """
         You are playing Connect Four as {symbol}.
 
@@ -70,42 +70,21 @@ class ConnectFourAIPlayer(AIPlayer):
             },
             "required": [
                 "move",
-            ]
+            ],
+            "additionalProperties": False
         }
-        super().__init__(player_number, color.capitalize(), model, prompt_format, response_schema)
-
-    def get_move(self, game):
-        print(f"AI Player {self.player_number} ({self.color}) is thinking...")
+        super().__init__(player_number, color.capitalize(), model, prompt_format, response_schema, **kwargs)
 
+    def build_prompt(self, state):
         symbol = "R" if self.color.upper() == "RED" else "Y"
-        rows = 6
-        columns = 7
-
-        if isinstance(game, str):
-            board = [[None for _ in range(columns)] for _ in range(rows)]
-
-            if game:
-                moves = game.strip().split("\n") if "\n" in game else game.strip().split()
-                for move_entry in moves:
-                    move_entry = move_entry.strip()
-                    if len(move_entry) >= 2 and move_entry[0] in "RY" and move_entry[1:].isdigit():
-                        piece = move_entry[0]
-                        col = int(move_entry[1:]) - 1
-                        if 0 <= col < columns:
-                            for row in range(rows - 1, -1, -1):
-                                if board[row][col] is None:
-                                    board[row][col] = piece
-                                    break
-        else:
-            board = game.board
-            rows = game.rows
-            columns = game.columns
+        board = state.board
+        rows = len(board)
+        columns = len(board[0])
 
         board_lines = []
-        for row in range(rows):
+        for row in board:
             line = ""
-            for col in range(columns):
-                piece = board[row][col]
+            for piece in row:
                 if piece is None:
                     line += " ·"
                 else:
@@ -115,17 +94,15 @@ class ConnectFourAIPlayer(AIPlayer):
         board_display = "\n".join(board_lines)
 
         column_status = []
-        available_columns = []
-        for col in range(1, columns + 1):
-            if board[0][col - 1] is None:
-                available_columns.append(str(col))
-                pieces_in_col = sum(1 for row in range(rows) if board[row][col - 1] is not None)
-                column_status.append(f"Column {col}: {rows - pieces_in_col} spaces left")
+        for col in range(columns):
+            if board[0][col] is None:
+                pieces_in_col = sum(1 for row in board if row[col] is not None)
+                column_status.append(f"Column {col + 1}: {rows - pieces_in_col} spaces left")
             else:
-                column_status.append(f"Column {col}: FULL")
+                column_status.append(f"Column {col + 1}: FULL")
 
         column_status_str = ", ".join(column_status)
-        available_list = ", ".join(available_columns)
+        available_list = ", ".join(state.legal_moves)
 
         message = self.prompt_format.format(
             symbol=symbol,
@@ -134,5 +111,4 @@ class ConnectFourAIPlayer(AIPlayer):
             available_list=available_list
         )
 
-        move = self._prompt_model(message=message)
-        return move
\ No newline at end of file
+        return message
\ No newline at end of file
@@ -0,0 +1,61 @@
+from collections.abc import Sequence
+
+
+class MoveHistory(Sequence):
+    # Read-only view of the first `length` entries of a game's move log. Snapshots share the live log
+    # instead of copying it every turn: entries are only ever appended to a shared log, and
+    # Game.truncate_log gives the game a new list rather than shortening one a view still reads.
+    __slots__ = ("_entries", "_length")
+
+    def __init__(self, entries, length=None):
+        self._entries = entries
+        self._length = len(entries) if length is None else length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._entries[:self._length][index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("move history index out of range")
+        return self._entries[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, (MoveHistory, tuple, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"MoveHistory({list(self)!r})"
+
+
+class GameState:
+    # Read-only snapshot of a game at one turn, handed to players instead of the live Game or a
+    # gamelog string. Every field is immutable (tuples, read-only mappings, bytes, a MoveHistory), so
+    # a player running on another thread or event loop sees exactly the position it was asked about.
+    __slots__ = ("board", "legal_moves", "player", "turn", "history", "formatted_gamelog", "position_key")
+
+    def __init__(self, board, legal_moves, player, turn, history, formatted_gamelog, position_key=None):
+        set_field = object.__setattr__
+        set_field(self, "board", board)
+        set_field(self, "legal_moves", legal_moves)
+        set_field(self, "player", player)
+        set_field(self, "turn", turn)
+        set_field(self, "history", history)
+        set_field(self, "formatted_gamelog", formatted_gamelog)
+        set_field(self, "position_key", position_key)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"GameState is read-only, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"GameState is read-only, cannot delete '{name}'")
+
+    def __repr__(self):
+        return f"GameState(player={self.player}, turn={self.turn}, moves={len(self.history)})"
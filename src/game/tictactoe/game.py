@@ -1,5 +1,10 @@
 from copy import deepcopy
+from types import MappingProxyType
+
 from ..base import Game
+from ...events import MOVE_PLAYED, INVALID_MOVE, GAME_OVER
+
+ALL_POSITIONS = ["a1", "a2", "a3", "b1", "b2", "b3", "c1", "c2", "c3"]
 
 
 class TicTacToeGame(Game):
@@ -50,16 +55,27 @@ class TicTacToeGame(Game):
     def initialize_game(self):
         return {}
 
+    def position_key(self):
+        return self.current_player, frozenset(self.board_status.items())
+
+    def _generate_legal_moves(self):
+        return [pos for pos in ALL_POSITIONS if pos not in self.board_status]
+
+    def board_snapshot(self):
+        return MappingProxyType(dict(self.board_status))
+
     def log_move(self, position, symbol):
-        self.gamelog.append(f"{symbol}{position}")
+        self.record_move(f"{symbol}{position}")
 
     def play_move(self, move):
         if not self._validate_move_format(move):
-            print(f"Move '{move}' is not valid format!")
+            self.events.emit(INVALID_MOVE, self, player=self.current_player, move=move,
+                             reason=f"Move '{move}' is not valid format!")
             return False
 
         if move in self.board_status:
-            print(f"Position {move} is already occupied!")
+            self.events.emit(INVALID_MOVE, self, player=self.current_player, move=move,
+                             reason=f"Position {move} is already occupied!")
             return False
 
         current_symbol = "x" if self.current_player == 1 and self.player_color == "x" else "o"
@@ -70,18 +86,17 @@ class TicTacToeGame(Game):
         self.board_status[move] = current_symbol.upper()
         self.log_move(move, current_symbol.upper())
 
-        print(f"Player {self.current_player} plays: {move}")
-        print(str(self))
+        self.events.emit(MOVE_PLAYED, self, player=self.current_player, move=move)
 
         if self._check_win(current_symbol.upper()):
             self.winner = self.current_player
             self.game_over = True
-            print(f"Player {self.current_player} ({current_symbol.upper()}) wins!")
+            self.events.emit(GAME_OVER, self, winner=self.current_player, reason="win", color=current_symbol.upper())
             return "win"
 
         if len(self.board_status) == 9:
             self.game_over = True
-            print("Game is a draw!")
+            self.events.emit(GAME_OVER, self, winner=None, reason="draw")
             return True
 
         self.turn_count += 1
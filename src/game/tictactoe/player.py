@@ -12,7 +12,7 @@ class TicTacToeHumanPlayer(HumanPlayer):
 
 
 class TicTacToeAIPlayer(AIPlayer):
-    def __init__(self, player_number, color, model="gpt-oss:120b-cloud"):
+    def __init__(self, player_number, color, model="gpt-oss:120b-cloud", **kwargs):
         prompt_format = """
         You are playing Tic Tac Toe as {symbol}.
 
@@ -57,59 +57,28 @@ class TicTacToeAIPlayer(AIPlayer):
             },
             "required": [
                 "move",
-            ]
+            ],
+            "additionalProperties": False
         }
-        super().__init__(player_number, color.upper(), model, prompt_format, response_schema)
-
-    def get_move(self, game):
-        print(f"AI Player {self.player_number} ({self.color}) is thinking...")
-
-        if isinstance(game, str):
-            all_positions = ["a1", "a2", "a3", "b1", "b2", "b3", "c1", "c2", "c3"]
-            moves = game.strip().split("\n") if game else []
-            occupied = {}
-
-            for move in moves:
-                parts = move.split()
-                for part in parts:
-                    if len(part) >= 3 and part[0] in 'XO' and part[1:3] in all_positions:
-                        occupied[part[1:3]] = part[0]
-
-            available = [pos for pos in all_positions if pos not in occupied]
-
-            board_lines = []
-            for row in ['3', '2', '1']:
-                line = f"{row}  "
-                for col in ['a', 'b', 'c']:
-                    pos = f"{col}{row}"
-                    if pos in occupied:
-                        line += f" {occupied[pos]}"
-                    else:
-                        line += " ·"
-                board_lines.append(line)
-            board_display = "\n".join(board_lines)
-
-            occupied_list = ", ".join([f"{pos}:{symbol}" for pos, symbol in occupied.items()]) if occupied else "None"
-            available_list = ", ".join(available)
-        else:
-            all_positions = ["a1", "a2", "a3", "b1", "b2", "b3", "c1", "c2", "c3"]
-            available = [pos for pos in all_positions if pos not in game.board_status]
-
-            board_lines = []
-            for row in ['3', '2', '1']:
-                line = f"{row}  "
-                for col in ['a', 'b', 'c']:
-                    pos = f"{col}{row}"
-                    if pos in game.board_status:
-                        line += f" {game.board_status[pos]}"
-                    else:
-                        line += " ·"
-                board_lines.append(line)
-            board_display = "\n".join(board_lines)
-
-            occupied_list = ", ".join(
-                [f"{pos}:{symbol}" for pos, symbol in game.board_status.items()]) if game.board_status else "None"
-            available_list = ", ".join(available)
+        super().__init__(player_number, color.upper(), model, prompt_format, response_schema, **kwargs)
+
+    def build_prompt(self, state):
+        board = state.board
+
+        board_lines = []
+        for row in ['3', '2', '1']:
+            line = f"{row}  "
+            for col in ['a', 'b', 'c']:
+                pos = f"{col}{row}"
+                if pos in board:
+                    line += f" {board[pos]}"
+                else:
+                    line += " ·"
+            board_lines.append(line)
+        board_display = "\n".join(board_lines)
+
+        occupied_list = ", ".join([f"{pos}:{symbol}" for pos, symbol in board.items()]) if board else "None"
+        available_list = ", ".join(state.legal_moves)
 
         message = self.prompt_format.format(
             symbol=self.color,
@@ -118,5 +87,4 @@ class TicTacToeAIPlayer(AIPlayer):
             available_list=available_list
         )
 
-        move = self._prompt_model(message=message)
-        return move
\ No newline at end of file
+        return message
\ No newline at end of file
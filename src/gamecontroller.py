@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 from .gameregistry import GameRegistry
 from .tournament import LLMTournament
 
@@ -49,11 +52,18 @@ class GameController:
         games_input = input("Games per pair? (default 2): ").strip()
         games_per_pair = int(games_input) if games_input.isnumeric() else 2
 
+        workers_input = input("Games to run in parallel? (default 1): ").strip()
+        workers = int(workers_input) if workers_input.isnumeric() and int(workers_input) > 0 else 1
+
+        resume_input = input("Resume the last unfinished tournament? (y/N): ").strip().lower()
+
         self.tournament = LLMTournament(
             game_name=self.game_name,
             llm_models=models,
             max_turns=turns,
-            games_per_pair=games_per_pair
+            games_per_pair=games_per_pair,
+            workers=workers,
+            resume=resume_input in ["y", "yes"]
         )
         return True
 
@@ -114,12 +124,26 @@ class GameController:
         else:
             self._play_single_game()
 
+    async def aplay(self):
+        if self.mode == "tournament":
+            await self.tournament.arun_tournament()
+            self._report_tournament()
+        else:
+            await self._aplay_single_game()
+
     def _play_tournament(self):
         self.tournament.run_tournament()
+        self._report_tournament()
+
+    def _report_tournament(self):
         self.tournament.print_summary()
         filename = self.tournament.save_results()
         print(f"\nDetailed results saved to: {filename}")
 
+    def _both_ai(self):
+        from .players import AIPlayer
+        return all(isinstance(player, AIPlayer) for player in self.players.values())
+
     def _play_single_game(self):
         if self.game is None:
             print("Please start a valid game first.")
@@ -129,32 +153,61 @@ class GameController:
         print(str(self.game))
 
         game_over = False
+        both_ai = self._both_ai()
+        delay = 1.0
 
-        from .players import AIPlayer
-        both_ai = all(isinstance(player, AIPlayer) for player in self.players.values())
+        while not game_over and turn_count < self.game.max_turns:
+            print(f"\n--- Turn {turn_count} ---")
+
+            current_player = self.players[self.game.current_player]
+
+            move = current_player.get_move(self.game.snapshot())
 
-        if both_ai:
-            import time
-            delay = 1.0
+            game_over, played = self._handle_result(self.game.play_move(move))
+            if played:
+                turn_count += 1
+
+                if both_ai and not game_over:
+                    time.sleep(delay)
+
+        self._report_single_game(game_over)
+
+    async def _aplay_single_game(self):
+        if self.game is None:
+            print("Please start a valid game first.")
+            return
+
+        turn_count = 0
+        print(str(self.game))
+
+        game_over = False
+        both_ai = self._both_ai()
+        delay = 1.0
 
         while not game_over and turn_count < self.game.max_turns:
             print(f"\n--- Turn {turn_count} ---")
 
             current_player = self.players[self.game.current_player]
 
-            move = current_player.get_move(self.game)
+            move = await current_player.aget_move(self.game.snapshot())
 
-            result = self.game.play_move(move)
-
-            if result == "win":
-                game_over = True
-                print(f"Game over! Player {self.game.winner} wins!")
-            elif result:
+            game_over, played = self._handle_result(self.game.play_move(move))
+            if played:
                 turn_count += 1
 
                 if both_ai and not game_over:
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
+
+        self._report_single_game(game_over)
+
+    def _handle_result(self, result):
+        # Returns (game_over, move_played)
+        if result == "win":
+            print(f"Game over! Player {self.game.winner} wins!")
+            return True, False
+        return self.game.game_over, bool(result)
 
+    def _report_single_game(self, game_over):
         if not game_over:
             print("Game over after", self.game.max_turns, "turns")
 
@@ -162,4 +215,4 @@ class GameController:
             winner_color = self.players[self.game.winner].color.capitalize()
             print(f"Final result: {winner_color} wins!")
         else:
-            print("Final result: Draw!")
\ No newline at end of file
+            print("Final result: Draw!")
@@ -1,54 +1,347 @@
 from abc import ABC, abstractmethod
 
-from ollama import chat
+import asyncio
+import atexit
 import json
+import threading
+import time
+from concurrent.futures import CancelledError
+
+from .backends import ModelResponse, get_backend
+from .events import TERMINAL, MODEL_CALL_STARTED, MODEL_CALL_FINISHED
+from .streaming import MoveExtractor
+
+MOVE_KEYS = ["move", "column", "position", "cell", "choice"]
+
+
+class MoveTimeoutError(TimeoutError):
+    pass
+
+
+class DeadlineLoop:
+    # A blocking call cannot be interrupted, so deadlines in the threaded path run the async request on
+    # an event loop in a background thread, shared by all workers of a tournament: per-loop state such
+    # as endpoint concurrency caps and request batches stays shared, and expiry cancels the in-flight
+    # HTTP request. close() cancels the calls still waiting; the loop and the clients opened on it are
+    # shut down once the last of them has returned, and calls made after that are refused.
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self.backends = {}
+        self.closed = False
+        self._calls = set()
+        self._lock = threading.Lock()
+
+    def run(self, backend, function, *args):
+        # Runs the coroutine function(*args), which calls backend, on the loop and waits for its result
+        with self._lock:
+            if self.closed:
+                raise CancelledError("The deadline loop is closed")
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, name="deadlines", daemon=True)
+                self.thread.start()
+            # Remembered so the shutdown can close the clients they opened on this loop
+            self.backends[id(backend)] = backend
+            future = asyncio.run_coroutine_threadsafe(function(*args), self.loop)
+            self._calls.add(future)
+
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            with self._lock:
+                self._calls.discard(future)
+                last = self.closed and not self._calls
+            if last:
+                self._shutdown()
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            calls = list(self._calls)
+        # Wakes the waiting workers right away; their requests are cancelled on the loop
+        for future in calls:
+            future.cancel()
+        if not calls:
+            self._shutdown()
+
+    def _shutdown(self):
+        with self._lock:
+            loop, thread, backends = self.loop, self.thread, list(self.backends.values())
+            self.loop, self.thread, self.backends = None, None, {}
+        if loop is None:
+            return
+
+        async def shutdown():
+            # Cancelled requests unwind before the clients they use are closed
+            tasks = asyncio.all_tasks() - {asyncio.current_task()}
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for backend in backends:
+                await backend.aclose()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+# Used by players created without a loop of their own, e.g. outside a tournament; closed at exit
+DEADLINES = DeadlineLoop()
+atexit.register(DEADLINES.close)
 
 
 class Player(ABC):
+    events = TERMINAL
+
     def __init__(self, player_number, color):
         self.player_number = player_number
         self.color = color
 
     @abstractmethod
-    def get_move(self, game):
+    def get_move(self, state):
+        # state is the GameState snapshot of the position to move in
         raise NotImplementedError
 
+    async def aget_move(self, state):
+        return await asyncio.to_thread(self.get_move, state)
+
 
 class HumanPlayer(Player):
     def __init__(self, player_number, color, player_prompt):
         super().__init__(player_number, color)
         self.player_prompt = player_prompt
 
-    def get_move(self, game):
+    def get_move(self, state):
         move = input(self.player_prompt.format(player_number=self.player_number, color=self.color))
         return move
 
 
 class AIPlayer(Player, ABC):
-    def __init__(self, player_number, color, model, prompt_format, response_schema):
+    # Per-position response schemas, shared by every player of the same class
+    _schema_cache = {}
+    schema_cache_size = 4096
+
+    def __init__(self, player_number, color, model, prompt_format, response_schema, host=None, options=None,
+                 cache=None, backend=None, timeout=None, stream=False, deadlines=None):
         super().__init__(player_number, color)
         self.prompt_format = prompt_format
         self.response_schema = response_schema
         self.model = model
+        self.host = host
+        if backend is None:
+            backend = f"ollama:{host}" if host else "ollama"
+        self.backend = get_backend(backend)
+        self.options = options
+        self.cache = cache
+        # Seconds one model call may take; the request is cancelled and MoveTimeoutError raised after that
+        self.timeout = timeout
+        # DeadlineLoop that runs the calls with a timeout in the threaded path
+        self.deadlines = deadlines or DEADLINES
+        # Stream replies and stop the generation as soon as the move field is complete
+        self.stream = stream
+        # Timings and token counts of the latest move request, for telemetry
+        self.last_metrics = {}
+
+    @abstractmethod
+    def build_prompt(self, state):
+        raise NotImplementedError
+
+    def format_move(self, move):
+        return move
+
+    def encode_move(self, move):
+        # Game notation -> the notation the model answers in; the inverse of format_move
+        return move
+
+    def schema_for(self, state):
+        # The response schema with the move restricted to the legal moves of this position, so
+        # backends with schema-constrained sampling cannot produce a move play_move rejects
+        if not state.legal_moves:
+            return self.response_schema
+        if state.position_key is None:
+            return self._build_schema(state.legal_moves)
+
+        key = (type(self), state.position_key)
+        schema = self._schema_cache.get(key)
+        if schema is None:
+            schema = self._build_schema(state.legal_moves)
+            if len(self._schema_cache) >= self.schema_cache_size:
+                self._schema_cache.clear()
+            self._schema_cache[key] = schema
+        return schema
+
+    def _build_schema(self, legal_moves):
+        properties = dict(self.response_schema["properties"])
+        move_key = next(key for key in MOVE_KEYS if key in properties)
+        move_schema = {k: v for k, v in properties[move_key].items() if k != "pattern"}
+        move_schema["enum"] = [self.encode_move(move) for move in legal_moves]
+        properties[move_key] = move_schema
+        return {**self.response_schema, "properties": properties}
+
+    def get_move(self, state, feedback=None):
+        started = self._call_started()
+        move = None
+        self.last_metrics = {}
+        try:
+            message = self._with_feedback(self.build_prompt(state), feedback)
+            schema = self.schema_for(state)
+            self.last_metrics["prompt_seconds"] = time.perf_counter() - started
+            move = self.format_move(self._prompt_model(message=message, schema=schema))
+            return move
+        finally:
+            self._call_finished(started, move)
+
+    async def aget_move(self, state, feedback=None):
+        started = self._call_started()
+        move = None
+        self.last_metrics = {}
+        try:
+            message = self._with_feedback(self.build_prompt(state), feedback)
+            schema = self.schema_for(state)
+            self.last_metrics["prompt_seconds"] = time.perf_counter() - started
+            move = self.format_move(await self._aprompt_model(message=message, schema=schema))
+            return move
+        finally:
+            self._call_finished(started, move)
+
+    def _call_started(self):
+        self.events.emit(MODEL_CALL_STARTED, self, player=self.player_number, color=self.color, model=self.model)
+        return time.perf_counter()
+
+    def _call_finished(self, started, move):
+        # move is None when the call failed
+        self.events.emit(MODEL_CALL_FINISHED, self, player=self.player_number, model=self.model, move=move,
+                         seconds=time.perf_counter() - started)
+
+    @staticmethod
+    def _with_feedback(message, feedback):
+        # feedback explains why the previous attempt at this turn was rejected
+        if not feedback:
+            return message
+        return f"{message.rstrip()}\n\nNOTE: {feedback}\n"
+
+    def _request(self, message, schema=None):
+        return {
+            "model": self.model,
+            "messages": [{'role': 'user',
+                          'content': message}],
+            "format": schema or self.response_schema,
+            "options": self.options,
+        }
+
+    def _cache_key(self, message, schema=None):
+        if self.cache is None or not self.cache.accepts(self.options):
+            return None
+        return self.cache.make_key(self.model, schema or self.response_schema, message, self.options)
+
+    def _prompt_model(self, message, schema=None):
+        cache_key = self._cache_key(message, schema)
+        content = self.cache.get(cache_key) if cache_key else None
+        self.last_metrics["cached"] = content is not None
+
+        if content is None:
+            request = self._request(message, schema)
+            called = time.perf_counter()
+            if self.timeout:
+                response = self.deadlines.run(self.backend, self._timed_call, request)
+            else:
+                response = self._call(request)
+            self._record_response(response, time.perf_counter() - called)
+            content = response.content
+            if cache_key:
+                self.cache.put(cache_key, self.model, content)
+
+        return self._parse_response(content)
+
+    async def _aprompt_model(self, message, schema=None):
+        cache_key = self._cache_key(message, schema)
+        content = self.cache.get(cache_key) if cache_key else None
+        self.last_metrics["cached"] = content is not None
+
+        if content is None:
+            call = self._acall(self._request(message, schema))
+            called = time.perf_counter()
+            response = await (self._with_deadline(call) if self.timeout else call)
+            self._record_response(response, time.perf_counter() - called)
+            content = response.content
+            if cache_key:
+                self.cache.put(cache_key, self.model, content)
+
+        return self._parse_response(content)
+
+    def _record_response(self, response, seconds):
+        self.last_metrics.update(response.metrics)
+        self.last_metrics["model_seconds"] = seconds
+
+    def _call(self, request):
+        # One model call -> ModelResponse
+        if not self.stream:
+            return self.backend.chat(**request)
+
+        extractor = MoveExtractor(MOVE_KEYS)
+        metrics = {}
+        chunks = self.backend.stream_chat(**request)
+        try:
+            for chunk in chunks:
+                metrics.update(chunk.metrics)
+                if extractor.feed(chunk.content) is not None:
+                    break
+        finally:
+            chunks.close()
+        return self._stream_response(extractor, metrics)
+
+    async def _acall(self, request):
+        if not self.stream:
+            return await self.backend.achat(**request)
+
+        extractor = MoveExtractor(MOVE_KEYS)
+        metrics = {}
+        chunks = self.backend.astream_chat(**request)
+        try:
+            async for chunk in chunks:
+                metrics.update(chunk.metrics)
+                if extractor.feed(chunk.content) is not None:
+                    break
+        finally:
+            await chunks.aclose()
+        return self._stream_response(extractor, metrics)
+
+    @staticmethod
+    def _stream_response(extractor, metrics):
+        # Servers send the counters at the end of a stream, so one cut short after the move has usually
+        # not received them; they are then marked unknown (None) rather than reported as zero tokens
+        return ModelResponse(extractor.content(), {"prompt_eval_count": None, "eval_count": None, **metrics})
+
+    async def _timed_call(self, request):
+        return await self._with_deadline(self._acall(request))
 
-    def _prompt_model(self, message):
-        response = chat(
-            model=self.model,
-            messages=[{'role': 'user',
-                       'content': message}],
-            format=self.response_schema,
-            stream=False,
-        )
+    async def _with_deadline(self, request):
+        try:
+            return await asyncio.wait_for(request, self.timeout)
+        except asyncio.TimeoutError:
+            raise MoveTimeoutError(f"{self.model} did not answer within {self.timeout:g}s") from None
 
-        parsed = json.loads(response.message.content)
+    def _parse_response(self, content):
+        parsed = json.loads(content)
+        if not isinstance(parsed, dict):
+            raise ValueError(f"Model response is not a JSON object: {parsed!r}")
 
         move = None
-        for key in ["move", "column", "position", "cell", "choice"]:
+        for key in MOVE_KEYS:
             if key in parsed:
                 move = parsed[key]
                 break
 
         if move is None:
             raise KeyError(f"Model response missing valid key: {parsed}")
+        if isinstance(move, bool) or not isinstance(move, (str, int)):
+            raise ValueError(f"Model response has a {type(move).__name__} move instead of a string: {move!r}")
 
-        return str(move)
\ No newline at end of file
+        return str(move)
@@ -0,0 +1,303 @@
+import math
+from collections import Counter
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the bulk recompute falls back to plain Python
+    np = None
+
+INITIAL_RATING = 1500.0
+ELO_K = 32.0
+# Glicko-2 works on its own scale: mu = (rating - 1500) / GLICKO_SCALE, phi = RD / GLICKO_SCALE
+GLICKO_SCALE = 400 / math.log(10)
+INITIAL_RD = 350.0
+INITIAL_VOLATILITY = 0.06
+TAU = 0.5
+# Games each model plays per rating period, on average, when recomputing in bulk
+PERIOD_GAMES_PER_MODEL = 100
+Z_95 = 1.96
+_EPSILON = 1e-6
+
+
+def new_entry():
+    return {"elo": INITIAL_RATING, "rating": INITIAL_RATING, "rd": INITIAL_RD, "volatility": INITIAL_VOLATILITY}
+
+
+def game_score(record):
+    # (model1, model2, model1's score) of a result record: 1 for a win, 0.5 for a draw, 0 for a loss
+    model1, model2, winner = record["model1"], record["model2"], record["winner"]
+    if winner is None:
+        return model1, model2, 0.5
+    return model1, model2, 1.0 if winner == model1 else 0.0
+
+
+def expected_score(elo, opponent_elo):
+    return 1 / (1 + 10 ** ((opponent_elo - elo) / 400))
+
+
+def _g(phi):
+    return 1 / math.sqrt(1 + 3 * phi * phi / (math.pi * math.pi))
+
+
+def _volatility(phi, sigma, delta, v, tau):
+    # New volatility by the Illinois algorithm (step 5 of Glickman's Glicko-2 paper)
+    a = math.log(sigma * sigma)
+    phi2 = phi * phi
+    delta2 = delta * delta
+
+    def f(x):
+        ex = math.exp(x)
+        return ex * (delta2 - phi2 - v - ex) / (2 * (phi2 + v + ex) ** 2) - (x - a) / (tau * tau)
+
+    low = a
+    if delta2 > phi2 + v:
+        high = math.log(delta2 - phi2 - v)
+    else:
+        k = 1
+        while f(a - k * tau) < 0:
+            k += 1
+        high = a - k * tau
+
+    f_low, f_high = f(low), f(high)
+    while abs(high - low) > _EPSILON:
+        mid = low + (low - high) * f_low / (f_high - f_low)
+        f_mid = f(mid)
+        if f_mid * f_high <= 0:
+            low, f_low = high, f_high
+        else:
+            f_low /= 2
+        high, f_high = mid, f_mid
+    return math.exp(low / 2)
+
+
+def glicko2_update(entry, results, tau=TAU):
+    # One rating period for one model. results: (opponent entry, score) pairs, all rated with the
+    # opponents' ratings from before the period. Returns (rating, rd, volatility).
+    mu = (entry["rating"] - INITIAL_RATING) / GLICKO_SCALE
+    phi = entry["rd"] / GLICKO_SCALE
+    sigma = entry["volatility"]
+    if not results:
+        return entry["rating"], math.sqrt(phi * phi + sigma * sigma) * GLICKO_SCALE, sigma
+
+    information = 0.0
+    improvement = 0.0
+    for opponent, score in results:
+        g = _g(opponent["rd"] / GLICKO_SCALE)
+        expected = 1 / (1 + math.exp(-g * (mu - (opponent["rating"] - INITIAL_RATING) / GLICKO_SCALE)))
+        information += g * g * expected * (1 - expected)
+        improvement += g * (score - expected)
+
+    mu, phi, sigma = _glicko2_step(mu, phi, sigma, information, improvement, tau)
+    return INITIAL_RATING + mu * GLICKO_SCALE, phi * GLICKO_SCALE, sigma
+
+
+def _glicko2_step(mu, phi, sigma, information, improvement, tau):
+    # Steps 5-7 of Glicko-2 on its own scale, from the period's summed information and improvement
+    v = 1 / information
+    sigma = _volatility(phi, sigma, v * improvement, v, tau)
+    phi = 1 / math.sqrt(1 / (phi * phi + sigma * sigma) + 1 / v)
+    return mu + phi * phi * improvement, phi, sigma
+
+
+class Ratings:
+    # Elo and Glicko-2 ratings per model, kept in a plain dict (model -> elo, rating, rd, volatility)
+    # so it can live in the results summary. update() rates one game as it finishes: Elo with a fixed
+    # K factor, Glicko-2 treating the game as a rating period of its own for both players.
+    def __init__(self, table=None, k_factor=ELO_K, tau=TAU):
+        self.table = {} if table is None else table
+        self.k_factor = k_factor
+        self.tau = tau
+
+    def entry(self, model):
+        entry = self.table.get(model)
+        if entry is None:
+            entry = self.table[model] = new_entry()
+        return entry
+
+    def update(self, model1, model2, score1):
+        first, second = self.entry(model1), self.entry(model2)
+
+        change = self.k_factor * (score1 - expected_score(first["elo"], second["elo"]))
+        first["elo"] += change
+        second["elo"] -= change
+
+        before1, before2 = dict(first), dict(second)
+        first["rating"], first["rd"], first["volatility"] = glicko2_update(before1, [(before2, score1)], self.tau)
+        second["rating"], second["rd"], second["volatility"] = glicko2_update(before2, [(before1, 1 - score1)],
+                                                                             self.tau)
+
+    def apply(self, record):
+        self.update(*game_score(record))
+
+    def leaderboard(self, z=Z_95):
+        # Models by Glicko-2 rating, with the interval rating +- z * RD (95% for the default z)
+        rows = [
+            {
+                "model": model,
+                "elo": entry["elo"],
+                "rating": entry["rating"],
+                "rd": entry["rd"],
+                "low": entry["rating"] - z * entry["rd"],
+                "high": entry["rating"] + z * entry["rd"],
+            }
+            for model, entry in self.table.items()
+        ]
+        rows.sort(key=lambda row: row["rating"], reverse=True)
+        return rows
+
+
+def print_leaderboard(leaderboard):
+    print(f"{'RANK':<5} {'MODEL':<25} {'RATING':>8} {'RD':>6} {'95% INTERVAL':>15} {'ELO':>8}")
+    print("=" * 72)
+    for rank, row in enumerate(leaderboard, start=1):
+        interval = f"{row['low']:.0f}-{row['high']:.0f}"
+        print(f"{rank:<5} {row['model']:<25} {row['rating']:>8.0f} {row['rd']:>6.0f} {interval:>15} {row['elo']:>8.0f}")
+
+
+def recompute(records, period=None, tau=TAU, iterations=1000):
+    # Ratings rebuilt from a whole match history of result records (see recompute_games)
+    return recompute_games(map(game_score, records), period, tau, iterations)
+
+
+def recompute_games(games, period=None, tau=TAU, iterations=1000):
+    # Ratings rebuilt from a whole match history of (model1, model2, model1's score) games. Elo becomes
+    # the maximum-likelihood fit of the logistic model behind Elo, which does not depend on game order.
+    # Glicko-2 runs over rating periods of `period` games (default: about PERIOD_GAMES_PER_MODEL games
+    # per model). Uses NumPy when it is installed.
+    games = list(games)
+    model1 = list(map(itemgetter(0), games))
+    model2 = list(map(itemgetter(1), games))
+
+    names = list(dict.fromkeys(model1 + model2))
+    if not names:
+        return Ratings(tau=tau)
+    index = {name: i for i, name in enumerate(names)}
+    if period is None:
+        period = max(1, PERIOD_GAMES_PER_MODEL * len(names) // 2)
+
+    if np is not None:
+        # Model names become index arrays through C-level maps; no Python loop per game
+        first = np.fromiter(map(index.__getitem__, model1), dtype=np.intp, count=len(games))
+        second = np.fromiter(map(index.__getitem__, model2), dtype=np.intp, count=len(games))
+        scores = np.fromiter(map(itemgetter(2), games), dtype=float, count=len(games))
+        elo = _fit_elo_numpy(len(names), first, second, scores, iterations)
+        glicko = _glicko2_periods_numpy(len(names), first, second, scores, period, tau)
+    else:
+        first = list(map(index.__getitem__, model1))
+        second = list(map(index.__getitem__, model2))
+        scores = list(map(itemgetter(2), games))
+        elo = _fit_elo(len(names), first, second, scores, iterations)
+        glicko = _glicko2_periods(len(names), first, second, scores, period, tau)
+
+    table = {
+        name: {"elo": elo[i], "rating": glicko[0][i], "rd": glicko[1][i], "volatility": glicko[2][i]}
+        for i, name in enumerate(names)
+    }
+    return Ratings(table, tau=tau)
+
+
+def _fit_elo(count, first, second, scores, iterations):
+    # Minorization-maximization (Hunter 2004) for the Bradley-Terry strengths gamma = 10^(elo / 400).
+    # Every model also gets one virtual draw against a fixed 1500 opponent, so models that never won
+    # or never lost still get finite ratings; that opponent (index count) anchors the scale.
+    wins = [[0.0] * (count + 1) for _ in range(count + 1)]
+    for i, j, score in zip(first, second, scores):
+        wins[i][j] += score
+        wins[j][i] += 1 - score
+    for i in range(count):
+        wins[i][count] += 0.5
+        wins[count][i] += 0.5
+
+    games = [[wins[i][j] + wins[j][i] for j in range(count + 1)] for i in range(count + 1)]
+    total_wins = [sum(row) for row in wins]
+    gamma = [1.0] * (count + 1)
+    for _ in range(iterations):
+        updated = [
+            total_wins[i] / sum(games[i][j] / (gamma[i] + gamma[j]) for j in range(count + 1) if games[i][j])
+            for i in range(count)
+        ]
+        change = max((abs(new / old - 1) for new, old in zip(updated, gamma)), default=0.0)
+        gamma[:count] = updated
+        if change < 1e-10:
+            break
+    return [INITIAL_RATING + 400 * math.log10(strength) for strength in gamma[:count]]
+
+
+def _fit_elo_numpy(count, first, second, scores, iterations):
+    # Same fit as _fit_elo, with the games folded into a pairwise win matrix in one pass
+    size = count + 1
+    wins = np.bincount(first * size + second, weights=scores, minlength=size * size)
+    wins += np.bincount(second * size + first, weights=1 - scores, minlength=size * size)
+    wins = wins.reshape(size, size)
+    wins[:count, count] += 0.5
+    wins[count, :count] += 0.5
+
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)[:count]
+    gamma = np.ones(size)
+    for _ in range(iterations):
+        updated = total_wins / (games[:count] / (gamma[:count, None] + gamma[None, :])).sum(axis=1)
+        change = np.abs(updated / gamma[:count] - 1).max(initial=0.0)
+        gamma[:count] = updated
+        if change < 1e-10:
+            break
+    return (INITIAL_RATING + 400 * np.log10(gamma[:count])).tolist()
+
+
+def _glicko2_periods(count, first, second, scores, period, tau):
+    # Within a period, games between the same two models with the same result contribute the same
+    # terms, so they are counted first and each distinct game is evaluated once
+    mu = [0.0] * count
+    phi = [INITIAL_RD / GLICKO_SCALE] * count
+    sigma = [INITIAL_VOLATILITY] * count
+    for start in range(0, len(scores), period):
+        rows = slice(start, start + period)
+        information = [0.0] * count
+        improvement = [0.0] * count
+        for (i, j, score), games in Counter(zip(first[rows], second[rows], scores[rows])).items():
+            for player, opponent, result in ((i, j, score), (j, i, 1 - score)):
+                g = _g(phi[opponent])
+                expected = 1 / (1 + math.exp(-g * (mu[player] - mu[opponent])))
+                information[player] += games * g * g * expected * (1 - expected)
+                improvement[player] += games * g * (result - expected)
+
+        for k in range(count):
+            if information[k]:
+                mu[k], phi[k], sigma[k] = _glicko2_step(mu[k], phi[k], sigma[k], information[k], improvement[k], tau)
+            else:
+                phi[k] = math.sqrt(phi[k] * phi[k] + sigma[k] * sigma[k])
+    return [INITIAL_RATING + value * GLICKO_SCALE for value in mu], [value * GLICKO_SCALE for value in phi], sigma
+
+
+def _glicko2_periods_numpy(count, first, second, scores, period, tau):
+    # Glicko-2 sums vectorized over the games of each period; the periods themselves are sequential.
+    # Each game appears twice, once from either side, so a period is one contiguous slice.
+    players = np.stack([first, second], axis=1).ravel()
+    opponents = np.stack([second, first], axis=1).ravel()
+    outcomes = np.stack([scores, 1 - scores], axis=1).ravel()
+
+    mu = np.zeros(count)
+    phi = np.full(count, INITIAL_RD / GLICKO_SCALE)
+    sigma = np.full(count, INITIAL_VOLATILITY)
+    for start in range(0, len(players), 2 * period):
+        rows = slice(start, start + 2 * period)
+        player, opponent = players[rows], opponents[rows]
+
+        g = 1 / np.sqrt(1 + 3 * phi[opponent] ** 2 / math.pi ** 2)
+        expected = 1 / (1 + np.exp(-g * (mu[player] - mu[opponent])))
+        information = np.bincount(player, weights=g * g * expected * (1 - expected), minlength=count)
+        improvement = np.bincount(player, weights=g * (outcomes[rows] - expected), minlength=count)
+
+        # The volatility search is scalar: with a handful of models, per-call overhead would dominate
+        played = np.flatnonzero(information)
+        v = 1 / information[played]
+        sigma[played] = [_volatility(*values, tau) for values in zip(
+            phi[played].tolist(), sigma[played].tolist(), (v * improvement[played]).tolist(), v.tolist())]
+        phi_star = np.sqrt(phi ** 2 + sigma ** 2)
+        phi = phi_star
+        phi[played] = 1 / np.sqrt(1 / phi_star[played] ** 2 + 1 / v)
+        mu[played] += phi[played] ** 2 * improvement[played]
+
+    return ((INITIAL_RATING + mu * GLICKO_SCALE).tolist(), (phi * GLICKO_SCALE).tolist(), sigma.tolist())
+
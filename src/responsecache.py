@@ -0,0 +1,107 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    # On-disk prompt -> response cache keyed by model, response schema, prompt and sampling options.
+    # With deterministic_only, only calls sampled at temperature 0 are cached, since any other call
+    # is allowed to return something different next time.
+    def __init__(self, path="response_cache.sqlite", max_bytes=64 * 1024 * 1024, deterministic_only=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.deterministic_only = deterministic_only
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, content TEXT, size INTEGER, last_access REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.commit()
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(model, schema, prompt, options=None):
+        payload = json.dumps([model, schema, prompt, options or {}], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def accepts(self, options):
+        return not self.deterministic_only or (options or {}).get("temperature") == 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model, content):
+        size = len(key) + len(content.encode("utf-8"))
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if previous is not None:
+                self.total_bytes -= previous[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, size, time.time())
+            )
+            self.total_bytes += size
+            self.stores += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache fits in max_bytes again
+        while self.total_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                break
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self.total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
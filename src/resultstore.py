@@ -0,0 +1,254 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from .ratings import Ratings, game_score, recompute_games
+
+
+class ResultStore:
+    # Results live in two files: an append-only JSONL match log (one line per finished game,
+    # fsynced before the game counts as recorded) and a small JSON summary of per-model
+    # aggregates and ratings. The summary remembers how many bytes of the log it already covers,
+    # so loading only replays the games appended since the summary was last written.
+    # A third file caches the (model1, model2, score) of every game for bulk rating recomputes.
+    def __init__(self, summary_path="tournament_results.json", log_path=None):
+        self.summary_path = summary_path
+        self.log_path = log_path or os.path.splitext(summary_path)[0] + ".jsonl"
+        self.scores_path = os.path.splitext(self.log_path)[0] + ".scores.tsv"
+        self.summary = self._load_summary()
+        self._repair_log()
+        # Summaries written before ratings were tracked get them rebuilt from the whole log
+        unrated = "ratings" not in self.summary
+        self.ratings = Ratings(self.summary.setdefault("ratings", {}))
+        self._replay_log()
+        if unrated and self.summary["games_played"]:
+            self.recompute_ratings()
+
+    @staticmethod
+    def empty_summary():
+        return {
+            "last_updated": None,
+            "games_played": 0,
+            "log_offset": 0,
+            "models": {},
+            "ratings": {}
+        }
+
+    def _load_summary(self):
+        if not os.path.exists(self.summary_path):
+            return self.empty_summary()
+
+        with open(self.summary_path, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+        summary.setdefault("log_offset", 0)
+
+        legacy_matches = []
+        for model, stats in summary["models"].items():
+            for match in stats.pop("matches", []):
+                legacy_matches.append({"legacy": True, "model": model, **match})
+
+        if legacy_matches:
+            # Older whole-file results kept match lists inside each model; move them into the log once
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                for record in legacy_matches:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            summary["log_offset"] = os.path.getsize(self.log_path)
+            self.summary = summary
+            self.save_summary()
+
+        return summary
+
+    def _repair_log(self):
+        # A crash mid-append can leave a partial last line; cut it off so new records start cleanly
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            position = size
+            while position > 0:
+                chunk_start = max(0, position - 4096)
+                f.seek(chunk_start)
+                chunk = f.read(position - chunk_start)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    f.truncate(chunk_start + newline + 1)
+                    return
+                position = chunk_start
+            f.truncate(0)
+
+    def _replay_log(self):
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            f.seek(self.summary["log_offset"])
+            for line in f:
+                record = json.loads(line)
+                if not record.get("legacy"):
+                    self.apply(record)
+            self.summary["log_offset"] = f.tell()
+
+    def records(self):
+        # Every game record in the log, oldest first
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if not record.get("legacy"):
+                    yield record
+
+    def games(self):
+        # (model1, model2, model1's score) of every game in the log, oldest first. They come from the
+        # scores file, one tab-separated line per game; only games logged since it was last brought up
+        # to date are parsed from the log. Each update ends with a '#<log offset>' line saying how much
+        # of the log the lines before it cover; anything after the last such line is dropped.
+        games, covered, valid = self._read_scores()
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if covered > log_size:
+            # The log was replaced since the scores were cached
+            games, covered, valid = [], 0, 0
+
+        new_games = []
+        if covered < log_size:
+            with open(self.log_path, 'rb') as f:
+                f.seek(covered)
+                for line in f:
+                    record = json.loads(line)
+                    if not record.get("legacy"):
+                        new_games.append(game_score(record))
+                covered = f.tell()
+
+        if new_games or valid != self._scores_size():
+            with open(self.scores_path, 'ab') as f:
+                f.truncate(valid)
+                lines = [f"{model1}\t{model2}\t{score}\n" for model1, model2, score in new_games]
+                f.write("".join(lines).encode("utf-8") + f"#{covered}\n".encode("ascii"))
+        return games + new_games
+
+    def _scores_size(self):
+        return os.path.getsize(self.scores_path) if os.path.exists(self.scores_path) else 0
+
+    def _read_scores(self):
+        # (games, log bytes they cover, scores file bytes up to the last offset line)
+        if not os.path.exists(self.scores_path):
+            return [], 0, 0
+
+        with open(self.scores_path, 'rb') as f:
+            data = f.read()
+        marker = data.rfind(b"\n#") + 1
+        if not data.startswith(b"#", marker):
+            return [], 0, 0
+
+        try:
+            valid = data.index(b"\n", marker) + 1
+            covered = int(data[marker + 1:valid])
+            lines = data[:marker].decode("utf-8").split("\n")
+            games = [(model1, model2, float(score))
+                     for model1, model2, score in (line.split("\t") for line in lines if line and line[0] != "#")]
+        except ValueError:
+            # A damaged cache is rebuilt from the log
+            return [], 0, 0
+        return games, covered, valid
+
+    def recompute_ratings(self, period=None):
+        # Rebuilds the ratings from every game in the log (see ratings.recompute_games)
+        self.ratings = recompute_games(self.games(), period)
+        self.summary["ratings"] = self.ratings.table
+        return self.ratings
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            self.summary["log_offset"] = f.tell()
+        self.apply(record)
+
+    def extend(self, records):
+        # Bulk append with a single fsync, for merging logs
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self.apply(record)
+            f.flush()
+            os.fsync(f.fileno())
+            self.summary["log_offset"] = f.tell()
+
+    def _ensure_model_exists(self, model):
+        # Initialize model stats if not present
+        if model not in self.summary["models"]:
+            self.summary["models"][model] = {
+                "games": 0,
+                "wins": 0,
+                "losses": 0,
+                "draws": 0,
+                "valid_moves": 0,
+                "errors": 0,
+                "timeouts": 0
+            }
+
+    def apply(self, record):
+        # Update model aggregates from one game record
+        model1 = record["model1"]
+        model2 = record["model2"]
+        winner = record["winner"]
+        stats = record["stats"]
+        models = self.summary["models"]
+
+        self._ensure_model_exists(model1)
+        self._ensure_model_exists(model2)
+
+        models[model1]["games"] += 1
+        models[model2]["games"] += 1
+        self.summary["games_played"] += 1
+
+        if winner is None:
+            models[model1]["draws"] += 1
+            models[model2]["draws"] += 1
+        elif winner == model1:
+            models[model1]["wins"] += 1
+            models[model2]["losses"] += 1
+        else:
+            models[model2]["wins"] += 1
+            models[model1]["losses"] += 1
+
+        for model in (model1, model2):
+            models[model]["valid_moves"] += stats[model]["valid"]
+            models[model]["errors"] += stats[model]["errors"]
+            # Records written before timeouts were tracked have no counter
+            models[model]["timeouts"] = models[model].get("timeouts", 0) + stats[model].get("timeouts", 0)
+
+        self.ratings.apply(record)
+
+    def save_summary(self, path=None):
+        path = path or self.summary_path
+        self.summary["last_updated"] = datetime.now().isoformat()
+
+        # Write to a temporary file next to the target and rename it over, so readers never see half a file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".results-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.summary, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return path
@@ -0,0 +1,54 @@
+import random
+import threading
+
+
+class RetryPolicy:
+    # Decides what happens after a failed move request. Transport failures (server down, HTTP
+    # errors, timeouts) are retried after an exponential backoff with full jitter, so a struggling
+    # backend is not hammered by every game at once. Unusable replies and illegal moves are retried
+    # straight away with the rejection reason added to the prompt. Every retry draws on a per-game
+    # and a per-model budget; once either is spent, a failed request forfeits the turn.
+    # Unparseable JSON, a reply without a move, or one whose move has the wrong type
+    OUTPUT_ERRORS = (ValueError, KeyError, TypeError)
+
+    def __init__(self, max_consecutive_errors=5, base_delay=0.5, max_delay=30.0, game_budget=None,
+                 model_budget=None, seed=None):
+        self.max_consecutive_errors = max_consecutive_errors
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.game_budget = game_budget
+        self.model_budget = model_budget
+        self.model_retries = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def is_transport_error(cls, error):
+        return not isinstance(error, cls.OUTPUT_ERRORS)
+
+    def backoff(self, attempt):
+        # attempt counts consecutive transport failures of one player, starting at 1
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        with self._lock:
+            return self._rng.uniform(0, cap)
+
+    def allow_retry(self, model, game_retries):
+        # Takes one retry from the model's budget; False once it or the game's budget is spent
+        if self.game_budget is not None and game_retries >= self.game_budget:
+            return False
+        with self._lock:
+            used = self.model_retries.get(model, 0)
+            if self.model_budget is not None and used >= self.model_budget:
+                return False
+            self.model_retries[model] = used + 1
+        return True
+
+    @staticmethod
+    def illegal_move_feedback(move, legal_moves):
+        if move in legal_moves:
+            return f"Your previous move '{move}' was rejected. Choose a different move from the list."
+        return f"Your previous move '{move}' is not a legal move in this position. Choose one from the list."
+
+    @staticmethod
+    def output_error_feedback(error):
+        return f"Your previous reply could not be used ({error}). Respond with a JSON object containing the move."
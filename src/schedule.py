@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class TournamentSchedule:
+    # Work queue of scheduled games persisted as an append-only JSONL file: a header line describing
+    # the tournament, one line per scheduled game, then one line per status change. Loading replays
+    # the file, so the latest status of every game survives a crash or Ctrl-C.
+    def __init__(self, path, header, games, statuses=None):
+        self.path = path
+        self.header = header
+        self.games = games
+        self.statuses = statuses if statuses is not None else {game["game_id"]: PENDING for game in games}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path, game_name, pairings, games_per_pair, tournament_id=None, shard=None):
+        # shard=(index, count) keeps every count-th game starting at index, so separate processes
+        # given the same tournament_id split one schedule without overlap
+        tournament_id = tournament_id or datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        header = {
+            "tournament_id": tournament_id,
+            "game_name": game_name,
+            "games_per_pair": games_per_pair,
+            "shard": list(shard) if shard else None,
+            "created_at": datetime.now().isoformat(),
+        }
+
+        games = []
+        for model1, model2 in pairings:
+            for _ in range(games_per_pair):
+                games.append({
+                    "game_id": f"{tournament_id}:{len(games) + 1}",
+                    "model1": model1,
+                    "model2": model2,
+                })
+
+        if shard:
+            index, count = shard
+            games = games[index::count]
+
+        schedule = cls(path, header, games)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"header": header}, ensure_ascii=False) + "\n")
+            for game in games:
+                f.write(json.dumps({"game": game}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return schedule
+
+    @classmethod
+    def load(cls, path):
+        header = None
+        games = []
+        statuses = {}
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # torn write from a crash
+                entry = json.loads(line)
+                if "header" in entry:
+                    header = entry["header"]
+                elif "game" in entry:
+                    games.append(entry["game"])
+                    statuses[entry["game"]["game_id"]] = PENDING
+                else:
+                    statuses[entry["game_id"]] = entry["status"]
+
+        if header is None:
+            raise ValueError(f"Schedule file '{path}' has no header")
+
+        return cls(path, header, games, statuses)
+
+    @property
+    def tournament_id(self):
+        return self.header["tournament_id"]
+
+    def mark(self, game_id, status):
+        with self._lock:
+            self.statuses[game_id] = status
+            # No fsync: the result log is the source of truth for finished games on resume
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({"game_id": game_id, "status": status}) + "\n")
+
+    def remaining(self, completed_ids=()):
+        # Games still to play: pending, failed, or in flight when the last run stopped
+        completed_ids = set(completed_ids)
+        remaining = []
+        for game in self.games:
+            game_id = game["game_id"]
+            if self.statuses.get(game_id) == DONE:
+                continue
+            if game_id in completed_ids:
+                # The result was logged but the run stopped before marking it done
+                self.mark(game_id, DONE)
+                continue
+            remaining.append(game)
+        return remaining
+
+    @staticmethod
+    def sort_key(game_id):
+        # Orders game ids by tournament, then by position in the full schedule
+        tournament_id, _, number = str(game_id).rpartition(":")
+        return (tournament_id, int(number)) if number.isdigit() else (str(game_id), 0)
+
+    def counts(self):
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for status in self.statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
@@ -0,0 +1,37 @@
+import json
+import re
+
+
+class MoveExtractor:
+    # Watches a JSON reply while it is being generated and reports the move as soon as its field
+    # is complete, e.g. after '{"move": "e2e4"' has arrived. The rest of the generation (closing
+    # brace, extra fields, a model that keeps talking) is not needed to play the move.
+    def __init__(self, keys):
+        names = "|".join(re.escape(key) for key in keys)
+        self.pattern = re.compile(
+            r'"(?P<key>' + names + r')"\s*:\s*'
+            r'(?:"(?P<string>(?:[^"\\]|\\.)*)"|(?P<number>-?\d+)(?=[\s,}]))'
+        )
+        self.text = ""
+        self.key = None
+        self.move = None
+
+    def feed(self, chunk):
+        # Returns the move once its value is complete, None while it is still incomplete
+        self.text += chunk
+        match = self.pattern.search(self.text)
+        if match is None:
+            return None
+
+        self.key = match.group("key")
+        if match.group("string") is not None:
+            self.move = json.loads(f'"{match.group("string")}"')
+        else:
+            self.move = int(match.group("number"))
+        return self.move
+
+    def content(self):
+        # What to parse and cache: just the move when it was found early, else everything received
+        if self.move is None:
+            return self.text
+        return json.dumps({self.key: self.move})
@@ -0,0 +1,130 @@
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .backends.fake import sample_schema
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        content = json.dumps(sample_schema(request.get("format"), self.server.rng))
+        self.server.requests += 1
+
+        if request.get("stream"):
+            self._send_stream(request, content)
+        else:
+            self._send_json(self._chat_response(request, content, done=True))
+
+    def _chat_response(self, request, content, done):
+        response = {
+            "model": request.get("model", ""),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+        }
+        if done:
+            response.update({
+                "done_reason": "stop",
+                "total_duration": int(self.server.latency * 1e9),
+                "load_duration": 0,
+                "prompt_eval_count": len(json.dumps(request.get("messages", []))) // 4,
+                "prompt_eval_duration": 0,
+                "eval_count": len(content) // 4 + 1,
+                "eval_duration": int(self.server.latency * 1e9),
+            })
+        return response
+
+    def _send_json(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, request, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        try:
+            for i in range(0, len(content), 4):
+                self._write_chunk(self._chat_response(request, content[i:i + 4], done=False))
+            self._write_chunk(self._chat_response(request, "", done=True))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped reading, same as an aborted generation
+            self.close_connection = True
+
+    def _write_chunk(self, body):
+        data = (json.dumps(body) + "\n").encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    # Minimal stand-in for the Ollama /api/chat endpoint that answers with random schema-valid moves
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, seed=None):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the Ollama chat API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each reply")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency, args.seed)
+    print(f"Stub model server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
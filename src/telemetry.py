@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style; +Inf is implied
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+STAGES = ("prompt", "queue", "model", "validation")
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        index = 0
+        while index < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation; None past the last finite bucket
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+
+class ModelTelemetry:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.outcomes = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.generation_seconds = 0.0
+        self.cached = 0
+        # Uncached calls whose server reported no token counts, e.g. streams cut short after the move
+        self.uncounted = 0
+
+    def tokens_per_second(self):
+        return self.completion_tokens / self.generation_seconds if self.generation_seconds else 0.0
+
+
+class Telemetry:
+    # Collects one record per move request (prompt build, queue wait, model latency, token counts,
+    # engine validation) and one per finished game (persistence time). Records can be appended to
+    # a JSONL file as they arrive; per-model rollups stay in memory and export as Prometheus text.
+    def __init__(self, jsonl_path=None, flush_size=64):
+        self.jsonl_path = jsonl_path
+        self.flush_size = flush_size
+        self.models = {}
+        self.persist = LatencyHistogram()
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def _model(self, model):
+        stats = self.models.get(model)
+        if stats is None:
+            stats = self.models[model] = ModelTelemetry()
+        return stats
+
+    def record_move(self, game_id, model, turn, outcome, call_metrics, validation_seconds=0.0):
+        # call_metrics: what the player measured for the call (AIPlayer.last_metrics)
+        model_seconds = call_metrics.get("model_seconds", 0.0)
+        queue_seconds = call_metrics.get("queue_seconds", 0.0)
+        # None when the server did not report the count; such calls add nothing to the token totals
+        prompt_tokens = call_metrics.get("prompt_eval_count")
+        completion_tokens = call_metrics.get("eval_count")
+        # Ollama reports generation time in nanoseconds; otherwise fall back to the wall time
+        eval_duration = call_metrics.get("eval_duration")
+        generation_seconds = eval_duration / 1e9 if eval_duration else model_seconds - queue_seconds
+
+        record = {
+            "type": "move",
+            "time": time.time(),
+            "game_id": game_id,
+            "model": model,
+            "turn": turn,
+            "outcome": outcome,
+            "cached": call_metrics.get("cached", False),
+            "prompt_seconds": call_metrics.get("prompt_seconds", 0.0),
+            "queue_seconds": queue_seconds,
+            "model_seconds": model_seconds,
+            "validation_seconds": validation_seconds,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }
+
+        with self._lock:
+            stats = self._model(model)
+            stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+            stats.stage_seconds["prompt"] += record["prompt_seconds"]
+            stats.stage_seconds["queue"] += queue_seconds
+            stats.stage_seconds["model"] += model_seconds
+            stats.stage_seconds["validation"] += validation_seconds
+            if record["cached"]:
+                stats.cached += 1
+            elif "model_seconds" in call_metrics:
+                stats.latency.observe(model_seconds)
+                stats.prompt_tokens += prompt_tokens or 0
+                if completion_tokens is None:
+                    stats.uncounted += 1
+                elif completion_tokens:
+                    stats.completion_tokens += completion_tokens
+                    stats.generation_seconds += max(generation_seconds, 0.0)
+            self._queue(record)
+
+    def record_persist(self, game_id, seconds):
+        with self._lock:
+            self.persist.observe(seconds)
+            self._queue({"type": "persist", "time": time.time(), "game_id": game_id, "seconds": seconds})
+
+    def _queue(self, record):
+        if self.jsonl_path is None:
+            return
+        self._pending.append(record)
+        if len(self._pending) >= self.flush_size:
+            self._write_pending()
+
+    def _write_pending(self):
+        records, self._pending = self._pending, []
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        with self._lock:
+            if self.jsonl_path is not None and self._pending:
+                self._write_pending()
+
+    def summary(self):
+        with self._lock:
+            return {
+                model: {
+                    "calls": stats.latency.count,
+                    "cached": stats.cached,
+                    "outcomes": dict(stats.outcomes),
+                    "mean_latency": stats.latency.total / stats.latency.count if stats.latency.count else 0.0,
+                    "p50_latency": stats.latency.quantile(0.5),
+                    "p95_latency": stats.latency.quantile(0.95),
+                    "stage_seconds": dict(stats.stage_seconds),
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                    "uncounted_calls": stats.uncounted,
+                    "tokens_per_second": stats.tokens_per_second(),
+                }
+                for model, stats in sorted(self.models.items())
+            }
+
+    def prometheus(self):
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(**values):
+            pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in values.items())
+            return "{" + pairs + "}"
+
+        with self._lock:
+            models = sorted(self.models.items())
+
+            metric("llmarena_model_latency_seconds", "histogram", "Wall time of uncached model calls")
+            for model, stats in models:
+                _histogram_lines(lines, "llmarena_model_latency_seconds", stats.latency, model=model)
+
+            metric("llmarena_stage_seconds_total", "counter", "Time spent per move stage")
+            for model, stats in models:
+                for stage, seconds in stats.stage_seconds.items():
+                    lines.append(f"llmarena_stage_seconds_total{labels(model=model, stage=stage)} {seconds}")
+
+            metric("llmarena_moves_total", "counter", "Move requests by outcome")
+            for model, stats in models:
+                for outcome, count in sorted(stats.outcomes.items()):
+                    lines.append(f"llmarena_moves_total{labels(model=model, outcome=outcome)} {count}")
+
+            metric("llmarena_cached_moves_total", "counter", "Moves answered from the response cache")
+            for model, stats in models:
+                lines.append(f"llmarena_cached_moves_total{labels(model=model)} {stats.cached}")
+
+            metric("llmarena_tokens_total", "counter", "Tokens processed by the model")
+            for model, stats in models:
+                lines.append(f"llmarena_tokens_total{labels(model=model, kind='prompt')} {stats.prompt_tokens}")
+                lines.append(f"llmarena_tokens_total{labels(model=model, kind='completion')} {stats.completion_tokens}")
+
+            metric("llmarena_uncounted_calls_total", "counter", "Model calls without token counts from the server")
+            for model, stats in models:
+                lines.append(f"llmarena_uncounted_calls_total{labels(model=model)} {stats.uncounted}")
+
+            metric("llmarena_tokens_per_second", "gauge", "Completion tokens per second of generation")
+            for model, stats in models:
+                lines.append(f"llmarena_tokens_per_second{labels(model=model)} {stats.tokens_per_second()}")
+
+            metric("llmarena_persist_seconds", "histogram", "Time to persist a finished game")
+            _histogram_lines(lines, "llmarena_persist_seconds", self.persist)
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Written to a temporary file and renamed, so a node_exporter textfile collector never reads half a file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(lines, name, histogram, **labels):
+    base = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    prefix = base + "," if base else ""
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    suffix = "{" + base + "}" if base else ""
+    lines.append(f"{name}_sum{suffix} {histogram.total}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
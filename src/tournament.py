@@ -1,16 +1,33 @@
-import json
+import asyncio
 import itertools
+import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
+from .events import (TERMINAL, MATCH_STARTED, MODEL_ERROR, TURN_FORFEITED, FALLBACK_MOVE, GAME_FAILED,
+                     TOURNAMENT_RESUMED)
 from .gameregistry import GameRegistry
+from .players import DeadlineLoop, MoveTimeoutError
+from .ratings import print_leaderboard
+from .resultstore import ResultStore
+from .retry import RetryPolicy
+from .schedule import TournamentSchedule, RUNNING, DONE, FAILED
 
 from datetime import datetime
 import random
 
 
+class TournamentInterrupted(Exception):
+    # Raised inside a game that was stopped at a move boundary; the game stays "running" and resume replays it
+    pass
+
+
 class LLMTournament:
-    def __init__(self, game_name, llm_models, max_turns=50, games_per_pair=2, results_file="tournament_results.json"):
+    def __init__(self, game_name, llm_models, max_turns=50, games_per_pair=2, results_file="tournament_results.json",
+                 workers=1, host=None, options=None, cache=None, resume=False, schedule_file=None,
+                 tournament_id=None, shard=None, backend=None, backends=None, retry_policy=None, move_timeout=None,
+                 timeouts=None, timeout_fallback="forfeit", stream=False, events=None, telemetry=None):
         if not GameRegistry.is_valid_game(game_name):
             raise ValueError(f"Game '{game_name}' not found in registry")
 
@@ -20,188 +37,397 @@ class LLMTournament:
         self.max_turns = max_turns
         self.games_per_pair = games_per_pair
         self.results_file = results_file
-        self.results = self._load_or_create_results()
-
-    def _load_or_create_results(self):
-        # Load or create results
-        if os.path.exists(self.results_file):
-            with open(self.results_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-
-        return {
-            "last_updated": None,
-            "games_played": 0,
-            "models": {}
-        }
-
-    def _ensure_model_exists(self, model):
-        # Initialize model stats if not present
-        if model not in self.results["models"]:
-            self.results["models"][model] = {
-                "games": 0,
-                "wins": 0,
-                "losses": 0,
-                "draws": 0,
-                "valid_moves": 0,
-                "errors": 0,
-                "matches": []
-            }
+        self.workers = max(1, workers)
+        self.host = host
+        self.backend = backend
+        # Per-model backend specs (or instances); models not listed use the default backend
+        self.backends = backends or {}
+        self.options = options
+        self.cache = cache
+        self.resume = resume
+        self.schedule_file = schedule_file or os.path.splitext(results_file)[0] + ".schedule.jsonl"
+        self.schedule = None
+        self.tournament_id = tournament_id
+        self.shard = shard
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Deadline per model call, optionally per model; a timed-out player forfeits the turn or
+        # ("random") gets a random legal move played for it
+        if timeout_fallback not in ("forfeit", "random"):
+            raise ValueError(f"Unknown timeout fallback '{timeout_fallback}'")
+        self.move_timeout = move_timeout
+        self.timeouts = timeouts or {}
+        self.timeout_fallback = timeout_fallback
+        # Event loop for the timed calls of run_tournament's workers; players of games played outside it
+        # share the players module's default loop
+        self.deadlines = None
+        self.stream = stream
+        # Sink for game, player and tournament events; a NullSink keeps headless runs from rendering boards
+        self.events = events or TERMINAL
+        # Optional Telemetry collecting per-move timings and token counts
+        self.telemetry = telemetry
+        self._lock = threading.RLock()
+        # Set on interrupt; games in flight stop before their next move
+        self._stopping = threading.Event()
+        self.store = ResultStore(results_file)
+        self.results = self.store.summary
 
     def create_ai_player(self, model_name, player_number, color):
         player_types = self.game_class.get_player_types()
         if "ai" not in player_types:
             raise ValueError(f"Game '{self.game_name}' does not support AI players")
-        return player_types["ai"](player_number, color, model_name)
-
-    def play_single_game(self, model1, model2, game_id):
+        player = player_types["ai"](player_number, color, model_name, host=self.host, options=self.options,
+                                    cache=self.cache, backend=self.backends.get(model_name, self.backend),
+                                    timeout=self.timeouts.get(model_name, self.move_timeout), stream=self.stream,
+                                    deadlines=self.deadlines)
+        player.events = self.events
+        return player
+
+    def _start_match(self, model1, model2, game_id):
         colors = self.game_class.get_default_colors()
         random.shuffle(colors)
 
         game = self.game_class(self.max_turns, colors[0])
+        game.events = self.events
         player1 = self.create_ai_player(model1, 1, colors[0])
         player2 = self.create_ai_player(model2, 2, colors[1])
-        players = {1: player1, 2: player2}
 
-        stats = {
-            model1: {"valid": 0, "errors": 0},
-            model2: {"valid": 0, "errors": 0}
+        self.events.emit(MATCH_STARTED, self, game_id=game_id, model1=model1, model2=model2)
+
+        return {
+            "game_id": game_id,
+            "model1": model1,
+            "model2": model2,
+            "game": game,
+            "players": {1: player1, 2: player2},
+            "stats": {
+                model1: {"valid": 0, "errors": 0, "timeouts": 0},
+                model2: {"valid": 0, "errors": 0, "timeouts": 0}
+            },
+            "consecutive_errors": {1: 0, 2: 0},
+            "transport_errors": {1: 0, 2: 0},
+            "feedback": {1: None, 2: None},
+            "forfeit": {1: False, 2: False},
+            "retries": 0,
         }
-        consecutive_errors = {1: 0, 2: 0}
 
-        print(f"Game {game_id}: {model1} vs {model2}")
+    def _next_player(self, match):
+        # Returns the player to move, or None once the game is finished
+        game = match["game"]
+        consecutive_errors = match["consecutive_errors"]
 
         while not game.game_over and game.turn_count < self.max_turns:
+            if self._stopping.is_set():
+                raise TournamentInterrupted(match["game_id"])
             current_num = game.current_player
-            current_player = players[current_num]
-            model = current_player.model
 
-            if consecutive_errors[current_num] >= 5:
-                consecutive_errors[current_num] = 0
+            attempts_left = consecutive_errors[current_num] < self.retry_policy.max_consecutive_errors
+            if match["forfeit"][current_num] or not attempts_left:
+                self.events.emit(TURN_FORFEITED, self, game_id=match["game_id"], player=current_num,
+                                 model=match["players"][current_num].model, attempts=consecutive_errors[current_num])
+                self._reset_attempts(match, current_num)
                 game.current_player = 2 if current_num == 1 else 1
                 game.turn_count += 1
                 continue
 
-            try:
-                game_log = "" if len(game.gamelog) == 0 else game.formatted_gamelog
-                move = current_player.get_move(game_log)
-                result = game.play_move(move)
-
-                if result == "win":
-                    stats[model]["valid"] += 1
-                    consecutive_errors[current_num] = 0
-                elif result:
-                    stats[model]["valid"] += 1
-                    consecutive_errors[current_num] = 0
-                else:
-                    stats[model]["errors"] += 1
-                    consecutive_errors[current_num] += 1
+            return match["players"][current_num]
 
-            except Exception as e:
-                print(f"Error from player {current_num}: {e}")
-                stats[model]["errors"] += 1
-                consecutive_errors[current_num] += 1
+        return None
+
+    @staticmethod
+    def _reset_attempts(match, number):
+        match["consecutive_errors"][number] = 0
+        match["transport_errors"][number] = 0
+        match["feedback"][number] = None
+        match["forfeit"][number] = False
+
+    def _apply_move(self, match, player, state, move):
+        validation_started = time.perf_counter()
+        result = match["game"].play_move(move)
+        if self.telemetry is not None:
+            self.telemetry.record_move(match["game_id"], player.model, state.turn, "valid" if result else "invalid",
+                                       player.last_metrics, time.perf_counter() - validation_started)
+        stats = match["stats"][player.model]
+
+        if result:
+            stats["valid"] += 1
+            self._reset_attempts(match, player.player_number)
+        else:
+            stats["errors"] += 1
+            match["consecutive_errors"][player.player_number] += 1
+            match["transport_errors"][player.player_number] = 0
+            match["feedback"][player.player_number] = self.retry_policy.illegal_move_feedback(move, state.legal_moves)
+            self._take_retry(match, player)
+
+    def _record_error(self, match, player, state, error):
+        # Returns how long to wait before asking this player again
+        number = player.player_number
+        self.events.emit(MODEL_ERROR, self, game_id=match["game_id"], player=number, model=player.model, error=error)
+        match["stats"][player.model]["errors"] += 1
+        match["consecutive_errors"][number] += 1
+        if self.telemetry is not None:
+            outcome = "timeout" if isinstance(error, MoveTimeoutError) else "error"
+            self.telemetry.record_move(match["game_id"], player.model, state.turn, outcome,
+                                       getattr(player, "last_metrics", {}))
+
+        if isinstance(error, MoveTimeoutError):
+            match["stats"][player.model]["timeouts"] += 1
+            if self.timeout_fallback == "random" and state.legal_moves:
+                self._play_fallback_move(match, player, state)
+            else:
+                match["forfeit"][number] = True
+            return 0
+
+        if not self._take_retry(match, player):
+            return 0
+
+        if self.retry_policy.is_transport_error(error):
+            match["transport_errors"][number] += 1
+            return self.retry_policy.backoff(match["transport_errors"][number])
+
+        match["transport_errors"][number] = 0
+        match["feedback"][number] = self.retry_policy.output_error_feedback(error)
+        return 0
+
+    def _play_fallback_move(self, match, player, state):
+        move = random.choice(state.legal_moves)
+        self.events.emit(FALLBACK_MOVE, self, game_id=match["game_id"], player=player.player_number,
+                         model=player.model, move=move)
+        if match["game"].play_move(move):
+            self._reset_attempts(match, player.player_number)
+        else:
+            match["forfeit"][player.player_number] = True
+
+    def _take_retry(self, match, player):
+        if self.retry_policy.allow_retry(player.model, match["retries"]):
+            match["retries"] += 1
+            return True
+        match["forfeit"][player.player_number] = True
+        return False
+
+    def _finish_match(self, match):
+        game = match["game"]
 
         # Determine winner
         winner = None
         if game.game_over:
-            for num, player in players.items():
+            for num, player in match["players"].items():
                 if hasattr(game, 'winner') and game.winner == num:
                     winner = player.model
                     break
 
         return {
-            "model1": model1,
-            "model2": model2,
+            "game_id": match["game_id"],
+            "model1": match["model1"],
+            "model2": match["model2"],
             "winner": winner,
-            "stats": stats
+            "stats": match["stats"]
         }
 
-    def run_tournament(self):
-        game_counter = 1
+    def play_single_game(self, model1, model2, game_id):
+        match = self._start_match(model1, model2, game_id)
 
-        # Each pair plays 1 time
-        for model1, model2 in itertools.combinations(self.llm_models, 2):
-            for _ in range(self.games_per_pair):
-                result = self.play_single_game(model1, model2, game_counter)
-                self._update_stats(result)
-                game_counter += 1
-                time.sleep(2)
+        while (player := self._next_player(match)) is not None:
+            state = match["game"].snapshot()
+            try:
+                move = player.get_move(state, feedback=match["feedback"][player.player_number])
+                self._apply_move(match, player, state, move)
+            except Exception as e:
+                if self._stopping.is_set():
+                    # The call was cancelled by the interrupt, not failed by the model
+                    raise TournamentInterrupted(game_id) from e
+                time.sleep(self._record_error(match, player, state, e))
 
-        self.save_results()
+        return self._finish_match(match)
 
-    def _update_stats(self, game_result):
-        # Update model stats from results
-        model1 = game_result["model1"]
-        model2 = game_result["model2"]
-        winner = game_result["winner"]
-        stats = game_result["stats"]
-
-        self._ensure_model_exists(model1)
-        self._ensure_model_exists(model2)
-
-        self.results["models"][model1]["games"] += 1
-        self.results["models"][model2]["games"] += 1
-        self.results["games_played"] += 1
-
-        if winner is None:
-            self.results["models"][model1]["draws"] += 1
-            self.results["models"][model2]["draws"] += 1
-            result1 = "draw"
-            result2 = "draw"
-        elif winner == model1:
-            self.results["models"][model1]["wins"] += 1
-            self.results["models"][model2]["losses"] += 1
-            result1 = "win"
-            result2 = "loss"
+    async def aplay_single_game(self, model1, model2, game_id):
+        match = self._start_match(model1, model2, game_id)
+
+        while (player := self._next_player(match)) is not None:
+            state = match["game"].snapshot()
+            try:
+                move = await player.aget_move(state, feedback=match["feedback"][player.player_number])
+                self._apply_move(match, player, state, move)
+            except Exception as e:
+                await asyncio.sleep(self._record_error(match, player, state, e))
+
+        return self._finish_match(match)
+
+    def _build_schedule(self):
+        # Resume the persisted schedule when asked to, otherwise start a fresh one
+        if self.resume and os.path.exists(self.schedule_file):
+            self.schedule = TournamentSchedule.load(self.schedule_file)
+            if self.schedule.header["game_name"] != self.game_name:
+                raise ValueError(f"Schedule '{self.schedule_file}' is for '{self.schedule.header['game_name']}', "
+                                 f"not '{self.game_name}'")
+            prefix = f"{self.schedule.tournament_id}:"
+            completed = (record.get("game_id") for record in self.store.records()
+                         if str(record.get("game_id", "")).startswith(prefix))
+            games = self.schedule.remaining(completed)
+            self.events.emit(TOURNAMENT_RESUMED, self, tournament_id=self.schedule.tournament_id,
+                             remaining=len(games), total=len(self.schedule.games))
         else:
-            self.results["models"][model2]["wins"] += 1
-            self.results["models"][model1]["losses"] += 1
-            result1 = "loss"
-            result2 = "win"
-
-        self.results["models"][model1]["valid_moves"] += stats[model1]["valid"]
-        self.results["models"][model1]["errors"] += stats[model1]["errors"]
-        self.results["models"][model2]["valid_moves"] += stats[model2]["valid"]
-        self.results["models"][model2]["errors"] += stats[model2]["errors"]
-
-        self.results["models"][model1]["matches"].append({
-            "opponent": model2,
-            "result": result1,
-            "valid_moves": stats[model1]["valid"],
-            "errors": stats[model1]["errors"]
-        })
-
-        self.results["models"][model2]["matches"].append({
-            "opponent": model1,
-            "result": result2,
-            "valid_moves": stats[model2]["valid"],
-            "errors": stats[model2]["errors"]
-        })
+            # Each pair plays games_per_pair times
+            self.schedule = TournamentSchedule.create(self.schedule_file, self.game_name,
+                                                      itertools.combinations(self.llm_models, 2),
+                                                      self.games_per_pair, self.tournament_id, self.shard)
+            games = self.schedule.games
+
+        return [(game["model1"], game["model2"], game["game_id"]) for game in games]
+
+    def _play_scheduled(self, model1, model2, game_id):
+        self.schedule.mark(game_id, RUNNING)
+        return self.play_single_game(model1, model2, game_id)
+
+    async def _aplay_scheduled(self, model1, model2, game_id):
+        self.schedule.mark(game_id, RUNNING)
+        return await self.aplay_single_game(model1, model2, game_id)
+
+    def _game_failed(self, game_id, error):
+        self.events.emit(GAME_FAILED, self, game_id=game_id, error=error)
+        self.schedule.mark(game_id, FAILED)
+
+    def run_tournament(self):
+        schedule = self._build_schedule()
+        self._stopping.clear()
+        self.deadlines = DeadlineLoop()
+
+        # The summary is saved even when interrupted; finished games are already in the log
+        try:
+            if self.workers > 1:
+                self._run_parallel(schedule)
+            else:
+                for model1, model2, game_id in schedule:
+                    try:
+                        result = self._play_scheduled(model1, model2, game_id)
+                    except Exception as e:
+                        self._game_failed(game_id, e)
+                        continue
+                    self._update_stats(result)
+                    time.sleep(2)
+        finally:
+            # Cancels the timed calls of workers still running after an interrupt; the loop and the async
+            # clients opened on it shut down once the last of them has returned
+            self.deadlines.close()
+            self.deadlines = None
+            self.save_results()
+
+    def _run_parallel(self, schedule):
+        # Games are submitted as workers free up, never more than `workers` at a time, so an interrupt
+        # leaves the rest of the schedule unstarted instead of queued behind the pool
+        games = iter(schedule)
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tournament")
+
+        def submit(count):
+            for model1, model2, game_id in itertools.islice(games, count):
+                running[executor.submit(self._play_scheduled, model1, model2, game_id)] = game_id
+
+        try:
+            submit(self.workers)
+            # Persist each game as soon as it finishes, so a crash only loses the games still in flight.
+            # The log is in completion order; `batch.py merge` sorts records by schedule position.
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect(future, running.pop(future))
+                submit(len(done))
+        except KeyboardInterrupt:
+            # Games in flight stop before their next move; keep whatever finished in the meantime
+            self._stopping.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future in [future for future in running if future.done()]:
+                self._collect(future, running.pop(future))
+            raise
+        executor.shutdown()
+
+    def _collect(self, future, game_id):
+        try:
+            result = future.result()
+        except TournamentInterrupted:
+            return
+        except Exception as e:
+            self._game_failed(game_id, e)
+            return
+        self._update_stats(result)
+
+    async def arun_tournament(self):
+        schedule = self._build_schedule()
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def play(model1, model2, game_id):
+            async with semaphore:
+                try:
+                    result = await self._aplay_scheduled(model1, model2, game_id)
+                except Exception as e:
+                    self._game_failed(game_id, e)
+                    return
+            # Persisted as soon as the game finishes, like the threaded runner
+            self._update_stats(result)
+
+        try:
+            await asyncio.gather(*(play(model1, model2, game_id) for model1, model2, game_id in schedule))
+        finally:
+            self.save_results()
+
+    def _update_stats(self, game_result):
+        with self._lock:
+            self._merge_result(game_result)
+
+    def _merge_result(self, game_result):
+        record = dict(game_result, finished_at=datetime.now().isoformat())
+        persist_started = time.perf_counter()
+        self.store.append(record)
+        if self.telemetry is not None:
+            self.telemetry.record_persist(game_result["game_id"], time.perf_counter() - persist_started)
+        self.schedule.mark(game_result["game_id"], DONE)
 
     def save_results(self, filename=None):
-        # Save results to file
+        # Save the aggregate summary; match records are already in the append-only log
         if filename:
             self.results_file = filename
 
-        self.results["last_updated"] = datetime.now().isoformat()
-
-        with open(self.results_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        with self._lock:
+            self.store.save_summary(self.results_file)
 
+        self.events.flush()
+        if self.telemetry is not None:
+            self.telemetry.flush()
         print("\n")
         return self.results_file
 
     def print_summary(self):
         print(
-            f"{'MODEL':<25} {'GAMES':>6} {'WINS':>6} {'LOSSES':>6} {'DRAWS':>6} {'VALID':>8} {'ERRORS':>8} {'WIN%':>8}")
-        print("=" * 80)
+            f"{'MODEL':<25} {'GAMES':>6} {'WINS':>6} {'LOSSES':>6} {'DRAWS':>6} {'VALID':>8} {'ERRORS':>8} "
+            f"{'TIMEOUTS':>8} {'WIN%':>8}")
+        print("=" * 89)
 
         for model, stats in sorted(self.results["models"].items()):
             win_rate = (stats["wins"] / stats["games"] * 100) if stats["games"] > 0 else 0
             print(f"{model:<25} {stats['games']:>6} {stats['wins']:>6} {stats['losses']:>6} "
-                  f"{stats['draws']:>6} {stats['valid_moves']:>8} {stats['errors']:>8} {win_rate:>7.1f}%")
+                  f"{stats['draws']:>6} {stats['valid_moves']:>8} {stats['errors']:>8} "
+                  f"{stats.get('timeouts', 0):>8} {win_rate:>7.1f}%")
+
+        leaderboard = self.store.ratings.leaderboard()
+        if leaderboard:
+            print()
+            print_leaderboard(leaderboard)
 
         print(f"\nTotal games played: {self.results['games_played']}")
+        if self.cache is not None:
+            cache_stats = self.cache.stats()
+            print(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate'] * 100:.1f}% hit rate)")
+        if self.retry_policy.model_retries:
+            retries = ", ".join(f"{model}: {count}" for model, count in sorted(self.retry_policy.model_retries.items()))
+            print(f"Retries: {retries}")
+        if self.telemetry is not None:
+            for model, stats in self.telemetry.summary().items():
+                p95 = f"<={stats['p95_latency']}s" if stats["p95_latency"] is not None else "n/a"
+                uncounted = ""
+                if stats["uncounted_calls"]:
+                    uncounted = f" ({stats['uncounted_calls']} calls without token counts)"
+                print(f"Latency {model}: {stats['calls']} calls, mean {stats['mean_latency']:.3f}s, p95 {p95}, "
+                      f"{stats['tokens_per_second']:.1f} tokens/s{uncounted}")
         print(f"Last updated: {self.results['last_updated']}")
 
 
@@ -220,7 +446,8 @@ if __name__ == "__main__":
         llm_models=llm_models,
         max_turns=5,
         games_per_pair=2,
-        results_file="tournament_results.json"
+        results_file="tournament_results.json",
+        workers=4
     )
 
     tournament.run_tournament()
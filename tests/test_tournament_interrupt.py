@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Interrupts a parallel tournament whose workers are all waiting on a timed model call
+INTERRUPTED_RUN = """
+import os, signal, sys, threading
+from src.events import NullSink
+from src.tournament import LLMTournament
+
+tournament = LLMTournament("tic tac toe", ["m1", "m2", "m3"], results_file=os.path.join(sys.argv[1], "results.json"),
+                           backend="fake:latency=1.5", workers=3, move_timeout=30, events=NullSink())
+threading.Timer(2, os.kill, args=(os.getpid(), signal.SIGINT)).start()
+try:
+    tournament.run_tournament()
+except KeyboardInterrupt:
+    print("interrupted")
+"""
+
+
+def test_interrupted_timed_parallel_run_exits(tmp_path):
+    started = time.monotonic()
+    process = subprocess.run([sys.executable, "-c", INTERRUPTED_RUN, str(tmp_path)], cwd=ROOT,
+                             capture_output=True, text=True, timeout=30)
+
+    assert process.returncode == 0, process.stderr
+    assert "interrupted" in process.stdout
+    # Workers stop as soon as their call is cancelled, not after the 1.5s calls or the 30s deadline
+    assert time.monotonic() - started < 10
+    assert os.path.exists(tmp_path / "results.json")